@@ -0,0 +1,69 @@
+"""store s3 keys instead of presigned urls
+
+Revision ID: 4b7e1f2a9c3d
+Revises: d87b522ac0e7
+Create Date: 2025-05-18 10:12:41.532018
+
+"""
+from urllib.parse import unquote, urlparse
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e1f2a9c3d'
+down_revision = 'd87b522ac0e7'
+branch_labels = None
+depends_on = None
+
+
+def _url_to_key(url: str | None) -> str | None:
+    """저장돼 있던 presigned URL 에서 S3 object key 만 추출합니다."""
+    if url is None or not url.startswith(("http://", "https://")):
+        return url
+    parsed = urlparse(url)
+    path = unquote(parsed.path).lstrip("/")
+    # path-style URL (s3.<region>.amazonaws.com/<bucket>/<key>) 은 버킷 이름을 떼어냄
+    if parsed.netloc.startswith(("s3.", "s3-")) and "/" in path:
+        path = path.split("/", 1)[1]
+    return path
+
+
+def _convert(table: str, column: str) -> None:
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")
+    ).fetchall()
+    for row_id, url in rows:
+        key = _url_to_key(url)
+        if key != url:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {column} = :key WHERE id = :id"),
+                {"key": key, "id": row_id},
+            )
+
+
+def upgrade():
+    op.alter_column('image', 'file_url',
+               new_column_name='file_key',
+               existing_type=sa.Text(),
+               existing_nullable=False)
+    op.alter_column('chapter', 'main_image_url',
+               new_column_name='main_image_key',
+               existing_type=sa.Text(),
+               existing_nullable=True)
+    _convert('image', 'file_key')
+    _convert('chapter', 'main_image_key')
+
+
+def downgrade():
+    # key 를 다시 presigned URL 로 되돌릴 수는 없으므로 컬럼 이름만 복원합니다.
+    op.alter_column('chapter', 'main_image_key',
+               new_column_name='main_image_url',
+               existing_type=sa.Text(),
+               existing_nullable=True)
+    op.alter_column('image', 'file_key',
+               new_column_name='file_url',
+               existing_type=sa.Text(),
+               existing_nullable=False)
@@ -0,0 +1,45 @@
+"""scope stored_object to user
+
+Revision ID: c7d9f1a3e5b2
+Revises: a4c8e2f6b913
+Create Date: 2025-05-27 10:21:44.630918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d9f1a3e5b2'
+down_revision = 'a4c8e2f6b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 중복 제거용 색인일 뿐이라 기존 행(사용자 구분 없음)은 버리고 새로 만듦. S3 객체와 image 행은 그대로 남음
+    op.drop_table('stored_object')
+    op.create_table('stored_object',
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_key', sa.Text(), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('model_key', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'sha256')
+    )
+
+
+def downgrade():
+    op.drop_table('stored_object')
+    op.create_table('stored_object',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_key', sa.Text(), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('model_key', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
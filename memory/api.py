@@ -3,9 +3,11 @@ from fastapi import APIRouter
 from memory.app.user.views import user_router
 from memory.app.chapter.views import chapter_router
 from memory.app.image.views import image_router
+from memory.app.internal.views import internal_router
 
 api_router = APIRouter()
 
 api_router.include_router(user_router, prefix="/users", tags=["users"])
 api_router.include_router(chapter_router, prefix="/chapters", tags=["chapters"])
-api_router.include_router(image_router, prefix="/images", tags=["images"])
\ No newline at end of file
+api_router.include_router(image_router, prefix="/images", tags=["images"])
+api_router.include_router(internal_router, prefix="/internal", tags=["internal"])
\ No newline at end of file
@@ -0,0 +1,127 @@
+import asyncio
+from loguru import logger
+
+from memory.app.chapter.store import ChapterStore
+from memory.common.metrics import METRICS
+from memory.common.openai_service import summarize_stories, merge_summaries, write_chapter_bookend
+from memory.database.settings import CHAPTER_SETTINGS
+
+
+class ChapterBookendGenerator:
+    """
+    챕터의 스토리로 prologue/epilogue 를 만드는 백그라운드 작업.
+    스토리가 저장될 때마다 notify() 로 알리면, bookend_debounce 동안 추가 스토리가 없을 때
+    마지막 생성 이후 bookend_trigger_images 개 이상 늘었는지 확인하고 다시 생성합니다.
+
+    챕터가 길면 스토리를 bookend_chunk_size 개씩 나눠 동시에 요약(map)한 뒤,
+    요약들을 같은 크기로 묶어 다시 합치는(reduce) 과정을 하나가 남을 때까지 반복합니다.
+    단계 수가 log(스토리 수) 에 비례하므로 챕터가 길어져도 지연 시간이 완만하게 늘어납니다.
+    """
+
+    def __init__(self):
+        self.chapter_store = ChapterStore()
+        self._chapter_semaphore: asyncio.Semaphore | None = None
+        self._call_semaphore: asyncio.Semaphore | None = None
+        self._timers: dict[int, asyncio.Task] = {}
+        self._running: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def notify(self, chapter_id: int) -> None:
+        # 디바운스: 대기 중인 타이머가 있으면 다시 시작
+        timer = self._timers.pop(chapter_id, None)
+        if timer is not None:
+            timer.cancel()
+        task = asyncio.create_task(self._debounce(chapter_id), name=f"chapter-bookend-{chapter_id}")
+        self._timers[chapter_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._timers.clear()
+
+    async def _debounce(self, chapter_id: int) -> None:
+        try:
+            await asyncio.sleep(CHAPTER_SETTINGS.bookend_debounce)
+        finally:
+            if self._timers.get(chapter_id) is asyncio.current_task():
+                del self._timers[chapter_id]
+
+        # 이미 생성 중인 챕터는 건너뜀: 끝난 뒤 다음 스토리가 저장될 때 다시 확인됩니다.
+        if chapter_id in self._running:
+            return
+        if self._chapter_semaphore is None:
+            self._chapter_semaphore = asyncio.Semaphore(CHAPTER_SETTINGS.bookend_concurrency)
+            self._call_semaphore = asyncio.Semaphore(CHAPTER_SETTINGS.bookend_map_concurrency)
+
+        self._running.add(chapter_id)
+        try:
+            new_stories = await self.chapter_store.count_stories_since_bookends(chapter_id)
+            if new_stories is None or new_stories < CHAPTER_SETTINGS.bookend_trigger_images:
+                return
+            async with self._chapter_semaphore:
+                await self._generate(chapter_id)
+        except Exception:
+            logger.exception(f"prologue/epilogue 생성 실패: chapter={chapter_id}")
+        finally:
+            self._running.discard(chapter_id)
+
+    async def _generate(self, chapter_id: int) -> None:
+        source = await self.chapter_store.get_bookend_source(chapter_id)
+        if source is None or not source[2]:
+            return
+        chapter_name, bookend_image_id, stories = source
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        summary, rounds = await self._map_reduce([content for _, content in stories])
+        prologue, epilogue = await asyncio.gather(
+            self._limited(write_chapter_bookend("prologue", chapter_name, summary)),
+            self._limited(write_chapter_bookend("epilogue", chapter_name, summary)),
+        )
+        updated = await self.chapter_store.update_bookends(
+            chapter_id,
+            expected_image_id=bookend_image_id,
+            prologue=prologue,
+            epilogue=epilogue,
+            bookend_image_id=stories[-1][0],
+        )
+
+        elapsed_ms = (loop.time() - started_at) * 1000
+        METRICS.observe("chapter.bookend.latency_ms", elapsed_ms)
+        METRICS.observe("chapter.bookend.rounds", rounds)
+        logger.info(
+            f"prologue/epilogue 생성: chapter={chapter_id} stories={len(stories)} rounds={rounds} "
+            f"{elapsed_ms:.0f}ms updated={updated}"
+        )
+
+    async def _map_reduce(self, stories: list[str]) -> tuple[str, int]:
+        """(챕터 전체 요약, map/reduce 단계 수) 를 반환합니다."""
+        size = max(CHAPTER_SETTINGS.bookend_chunk_size, 2)
+        summaries = await asyncio.gather(*(
+            self._limited(summarize_stories(None, stories[i:i + size]))
+            for i in range(0, len(stories), size)
+        ))
+        rounds = 1
+        while len(summaries) > 1:
+            summaries = await asyncio.gather(*(
+                self._limited(merge_summaries(summaries[i:i + size])) if len(summaries[i:i + size]) > 1
+                else self._passthrough(summaries[i])
+                for i in range(0, len(summaries), size)
+            ))
+            rounds += 1
+        return summaries[0], rounds
+
+    async def _limited(self, aw):
+        async with self._call_semaphore:
+            return await aw
+
+    @staticmethod
+    async def _passthrough(summary: str) -> str:
+        return summary
+
+
+CHAPTER_BOOKENDS = ChapterBookendGenerator()
@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from memory.app.chapter.models import Chapter
 from memory.app.image.dto.responses import ImageProfileResponse
+from memory.common.s3_client import PRESIGNED_URLS
 
 class ChapterProfileResponse(BaseModel):
     id: int
@@ -12,8 +13,8 @@ class ChapterProfileResponse(BaseModel):
 
     @staticmethod
     def from_chapter(chapter: Chapter) -> "ChapterProfileResponse":
-        # images 관계에서 첫 번째 URL을 우선 사용
-        first_url = chapter.images[0].file_url if chapter.images else None
+        # images 관계에서 첫 번째 이미지를 우선 사용
+        first_url = PRESIGNED_URLS.get_url(chapter.images[0].file_key) if chapter.images else None
         return ChapterProfileResponse(
             id=chapter.id,
             chapter_name=chapter.chapter_name,
@@ -46,6 +47,6 @@ class ChapterDetailResponse(BaseModel):
             chapter_name=chapter.chapter_name,
             prologue=chapter.prologue,
             epilogue=chapter.epilogue,
-            main_image_url=chapter.main_image_url,
+            main_image_url=PRESIGNED_URLS.get_url(chapter.main_image_key),
             images=[ImageProfileResponse.from_image(img) for img in chapter.images],
         )
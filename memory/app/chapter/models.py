@@ -20,7 +20,13 @@ class Chapter(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    main_image_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # 오래된 스토리를 접어 둔 요약과, 요약에 포함된 마지막 Image id
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_image_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # prologue/epilogue 를 만들 때 포함된 마지막 Image id
+    bookend_image_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    main_image_key: Mapped[str | None] = mapped_column(Text, nullable=True)  # 대표 이미지 S3 object key
     user_id: Mapped[int] = mapped_column(
         BigInteger, 
         ForeignKey("user.id", ondelete="CASCADE"),
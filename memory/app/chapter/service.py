@@ -8,6 +8,7 @@ from enum import Enum
 from memory.app.chapter.models import Chapter
 from memory.app.chapter.store import ChapterStore
 from memory.app.chapter.dto.reponses import ChapterProfileResponse
+from memory.database.settings import GPT_SETTINGS
 
 class TokenType(Enum):
     ACCESS = "access"
@@ -44,3 +45,27 @@ class ChapterService:
         if chapter is None:
             raise HTTPException(status_code=404, detail="Chapter not found")
         return chapter
+
+    async def ensure_chapter_exists(self, chapter_id: int) -> None:
+        """
+        Chapter 가 없으면 404 에러를 발생시킵니다.
+        """
+        if not await self.chapter_store.chapter_exists(chapter_id=chapter_id):
+            raise HTTPException(status_code=404, detail="Chapter not found")
+
+    async def get_story_context(
+        self,
+        chapter_id: int,
+        before_image_id: int | None = None,
+    ) -> tuple[str | None, List[str]]:
+        """
+        스토리 생성에 쓸 (챕터 요약, 이전 스토리 목록) 을 반환합니다. Chapter 가 없으면 404 에러를 발생시킵니다.
+        """
+        context = await self.chapter_store.get_story_context(
+            chapter_id=chapter_id,
+            before_image_id=before_image_id,
+            use_summary=GPT_SETTINGS.STORY_CONTEXT_MODE == "summary",
+        )
+        if context is None:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        return context
@@ -1,11 +1,12 @@
 from typing import Optional,List
-from sqlalchemy import select
+from sqlalchemy import select, update, func
 from datetime import datetime
 
 from memory.app.user.models import User
-from memory.database.annotation import transactional
+from memory.database.annotation import transactional, retry_on_disconnect
 from memory.database.connection import SESSION
 from memory.app.chapter.models import Chapter
+from memory.app.image.models import Image
 from sqlalchemy.orm import selectinload
 
 class ChapterStore:
@@ -29,7 +30,8 @@ class ChapterStore:
         result = await SESSION.execute(stmt)
         return result.scalar_one()
     
-    @transactional
+    @retry_on_disconnect
+    @transactional(read_only=True)
     async def get_chapters(
         self,
         user_id: int,
@@ -41,7 +43,8 @@ class ChapterStore:
         result = await SESSION.execute(stmt)
         return result.scalars().all()
     
-    @transactional
+    @retry_on_disconnect
+    @transactional(read_only=True)
     async def get_chapter_by_id(
         self,
         chapter_id: int,
@@ -53,4 +56,166 @@ class ChapterStore:
         stmt = select(Chapter).where(Chapter.id == chapter_id)
         result = await SESSION.execute(stmt)
         # id는 유니크하므로 scalar_one_or_none를 사용해 한 건 혹은 None
-        return result.scalar_one_or_none()
\ No newline at end of file
+        return result.scalar_one_or_none()
+
+    @retry_on_disconnect
+    @transactional
+    async def chapter_exists(self, chapter_id: int) -> bool:
+        """
+        Chapter 존재 여부만 확인합니다. (images 관계를 불러오지 않음)
+        """
+        stmt = select(Chapter.id).where(Chapter.id == chapter_id)
+        return await SESSION.scalar(stmt) is not None
+
+    @retry_on_disconnect
+    @transactional
+    async def get_story_context(
+        self,
+        chapter_id: int,
+        before_image_id: int | None = None,
+        use_summary: bool = True,
+    ) -> Optional[tuple[str | None, List[str]]]:
+        """
+        스토리 생성에 쓸 (챕터 요약, 요약 이후의 스토리 목록) 을 반환합니다. Chapter 가 없으면 None.
+        요약을 쓰지 않거나, before_image_id 보다 뒤의 스토리까지 요약에 들어가 있으면 요약 없이 전체를 반환합니다.
+        """
+        row = (
+            await SESSION.execute(
+                select(Chapter.summary, Chapter.summary_image_id).where(Chapter.id == chapter_id)
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+
+        summary, summary_image_id = row
+        if (
+            not use_summary
+            or summary is None
+            or (before_image_id is not None and summary_image_id >= before_image_id)
+        ):
+            summary, summary_image_id = None, None
+
+        stmt = (
+            select(Image.content)
+            .where(Image.chapter_id == chapter_id, Image.content.is_not(None))
+            .order_by(Image.id)
+        )
+        if summary_image_id is not None:
+            stmt = stmt.where(Image.id > summary_image_id)
+        if before_image_id is not None:
+            stmt = stmt.where(Image.id < before_image_id)
+        return summary, list((await SESSION.scalars(stmt)).all())
+
+    @transactional
+    async def get_unsummarized_stories(
+        self, chapter_id: int,
+    ) -> Optional[tuple[str | None, int | None, List[tuple[int, str]]]]:
+        """
+        (현재 요약, 요약에 포함된 마지막 Image id, 아직 요약되지 않은 (id, 스토리) 목록) 을 반환합니다.
+        """
+        row = (
+            await SESSION.execute(
+                select(Chapter.summary, Chapter.summary_image_id).where(Chapter.id == chapter_id)
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+
+        summary, summary_image_id = row
+        stmt = (
+            select(Image.id, Image.content)
+            .where(Image.chapter_id == chapter_id, Image.content.is_not(None))
+            .order_by(Image.id)
+        )
+        if summary_image_id is not None:
+            stmt = stmt.where(Image.id > summary_image_id)
+        stories = [(image_id, content) for image_id, content in (await SESSION.execute(stmt)).all()]
+        return summary, summary_image_id, stories
+
+    @transactional
+    async def update_summary(
+        self,
+        chapter_id: int,
+        expected_image_id: int | None,
+        summary: str,
+        summary_image_id: int,
+    ) -> bool:
+        """
+        다른 워커가 그 사이에 요약을 갱신하지 않았을 때만 저장합니다 (낙관적 동시성 제어).
+        """
+        condition = (
+            Chapter.summary_image_id.is_(None)
+            if expected_image_id is None
+            else Chapter.summary_image_id == expected_image_id
+        )
+        result = await SESSION.execute(
+            update(Chapter)
+            .where(Chapter.id == chapter_id, condition)
+            .values(summary=summary, summary_image_id=summary_image_id)
+        )
+        return result.rowcount == 1
+
+    @transactional
+    async def count_stories_since_bookends(self, chapter_id: int) -> Optional[int]:
+        """
+        prologue/epilogue 를 마지막으로 만든 뒤 추가된 스토리 수. Chapter 가 없으면 None.
+        """
+        bookend_image_id = (
+            await SESSION.execute(select(Chapter.bookend_image_id).where(Chapter.id == chapter_id))
+        ).one_or_none()
+        if bookend_image_id is None:
+            return None
+
+        stmt = select(func.count(Image.id)).where(
+            Image.chapter_id == chapter_id, Image.content.is_not(None)
+        )
+        if bookend_image_id[0] is not None:
+            stmt = stmt.where(Image.id > bookend_image_id[0])
+        return await SESSION.scalar(stmt)
+
+    @transactional
+    async def get_bookend_source(
+        self, chapter_id: int,
+    ) -> Optional[tuple[str, int | None, List[tuple[int, str]]]]:
+        """
+        prologue/epilogue 생성에 쓸 (챕터 이름, 이전에 포함된 마지막 Image id, 전체 (id, 스토리) 목록) 을 반환합니다.
+        """
+        row = (
+            await SESSION.execute(
+                select(Chapter.chapter_name, Chapter.bookend_image_id).where(Chapter.id == chapter_id)
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+
+        stmt = (
+            select(Image.id, Image.content)
+            .where(Image.chapter_id == chapter_id, Image.content.is_not(None))
+            .order_by(Image.id)
+        )
+        stories = [(image_id, content) for image_id, content in (await SESSION.execute(stmt)).all()]
+        return row[0], row[1], stories
+
+    @transactional
+    async def update_bookends(
+        self,
+        chapter_id: int,
+        expected_image_id: int | None,
+        prologue: str,
+        epilogue: str,
+        bookend_image_id: int,
+    ) -> bool:
+        """
+        다른 작업이 그 사이에 prologue/epilogue 를 갱신하지 않았을 때만 저장합니다.
+        """
+        condition = (
+            Chapter.bookend_image_id.is_(None)
+            if expected_image_id is None
+            else Chapter.bookend_image_id == expected_image_id
+        )
+        result = await SESSION.execute(
+            update(Chapter)
+            .where(Chapter.id == chapter_id, condition)
+            .values(prologue=prologue, epilogue=epilogue, bookend_image_id=bookend_image_id)
+        )
+        return result.rowcount == 1
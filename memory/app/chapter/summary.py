@@ -0,0 +1,81 @@
+import asyncio
+from loguru import logger
+
+from memory.app.chapter.store import ChapterStore
+from memory.common.openai_service import summarize_stories
+from memory.database.settings import GPT_SETTINGS
+
+
+class ChapterSummarizer:
+    """
+    챕터의 오래된 스토리를 롤링 요약으로 접는 백그라운드 작업.
+    최근 STORY_RECENT_COUNT 개를 넘는 스토리가 생기면 요약에 합치고, 요약에 포함된 마지막 Image id 를 기록합니다.
+    요청 처리 경로를 막지 않도록 스토리 저장 후 schedule() 로 예약만 합니다.
+    """
+
+    def __init__(self):
+        self.chapter_store = ChapterStore()
+        self._semaphore: asyncio.Semaphore | None = None
+        self._running: set[int] = set()
+        self._dirty: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def schedule(self, chapter_id: int) -> None:
+        if GPT_SETTINGS.STORY_CONTEXT_MODE != "summary":
+            return
+        task = asyncio.create_task(self._refresh(chapter_id), name=f"chapter-summary-{chapter_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _refresh(self, chapter_id: int) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(GPT_SETTINGS.SUMMARY_CONCURRENCY)
+        # 같은 챕터의 갱신이 이미 진행 중이면 표시만 남기고, 진행 중인 작업이 끝난 뒤 한 번 더 접습니다.
+        # 진행 중인 갱신이 읽은 스토리 목록에는 방금 저장된 스토리가 빠져 있을 수 있기 때문입니다.
+        if chapter_id in self._running:
+            self._dirty.add(chapter_id)
+            return
+        self._running.add(chapter_id)
+        try:
+            while True:
+                self._dirty.discard(chapter_id)
+                try:
+                    async with self._semaphore:
+                        await self._fold(chapter_id)
+                except Exception:
+                    logger.exception(f"챕터 요약 갱신 실패: chapter={chapter_id}")
+                if chapter_id not in self._dirty:
+                    break
+        finally:
+            self._running.discard(chapter_id)
+            self._dirty.discard(chapter_id)
+
+    async def _fold(self, chapter_id: int) -> None:
+        state = await self.chapter_store.get_unsummarized_stories(chapter_id)
+        if state is None:
+            return
+        summary, summary_image_id, stories = state
+
+        fold_count = len(stories) - GPT_SETTINGS.STORY_RECENT_COUNT
+        if fold_count <= 0:
+            return
+        folded = stories[:fold_count]
+
+        new_summary = await summarize_stories(summary, [content for _, content in folded])
+        updated = await self.chapter_store.update_summary(
+            chapter_id,
+            expected_image_id=summary_image_id,
+            summary=new_summary,
+            summary_image_id=folded[-1][0],
+        )
+        if not updated:
+            logger.info(f"챕터 요약이 다른 작업에서 먼저 갱신됨: chapter={chapter_id}")
+
+
+CHAPTER_SUMMARIZER = ChapterSummarizer()
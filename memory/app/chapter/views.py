@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, Path, Body, Depends
-from typing import Annotated
+from fastapi import APIRouter, HTTPException, Path, Body, Depends, Header
+from typing import Annotated, Optional
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,6 +9,7 @@ from memory.app.user.models import User
 from memory.app.chapter.dto.requests import ChapterCreateRequest
 from memory.app.chapter.dto.reponses import ChapterProfileResponse, ChapterListResponse, ChapterDetailResponse
 from memory.app.user.views import get_current_user_from_header
+from memory.app.idempotency.service import IDEMPOTENCY, request_fingerprint
 
 chapter_router = APIRouter()
 
@@ -16,12 +17,21 @@ chapter_router = APIRouter()
 async def create_chapter(
     user: Annotated[User, Depends(get_current_user_from_header)],
     request: ChapterCreateRequest,
-    chapter_service: Annotated[ChapterService, Depends()]
+    chapter_service: Annotated[ChapterService, Depends()],
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> ChapterProfileResponse:
     """
     chapter를 생성
+    Idempotency-Key 헤더가 있으면 같은 키로 재시도해도 chapter 는 한 번만 생성됩니다.
     """
-    return await chapter_service.add_chapter(user_id=user.id, chapter_name=request.name)
+    return await IDEMPOTENCY.run(
+        idempotency_key,
+        user.id,
+        "chapters.create",
+        request_fingerprint(request.model_dump(mode="json")),
+        lambda: chapter_service.add_chapter(user_id=user.id, chapter_name=request.name),
+        ChapterProfileResponse,
+    )
 
 
 @chapter_router.get("/get", status_code=201)
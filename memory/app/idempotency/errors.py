@@ -0,0 +1,13 @@
+from memory.common.errors import MysolHTTPException
+
+class InvalidIdempotencyKeyError(MysolHTTPException):
+    def __init__(self, message: str = "올바르지 않은 Idempotency-Key 입니다.") -> None:
+        super().__init__(status_code=400, detail=message)
+
+class IdempotentRequestInProgressError(MysolHTTPException):
+    def __init__(self, message: str = "같은 Idempotency-Key 의 요청이 아직 처리 중입니다.") -> None:
+        super().__init__(status_code=409, detail=message)
+
+class IdempotencyKeyReusedError(MysolHTTPException):
+    def __init__(self, message: str = "같은 Idempotency-Key 로 내용이 다른 요청을 보냈습니다.") -> None:
+        super().__init__(status_code=422, detail=message)
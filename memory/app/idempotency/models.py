@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, func, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from memory.database.common import Base
+
+class IdempotencyRecord(Base):
+    """
+    Idempotency-Key 로 들어온 요청의 처리 상태와 응답.
+    여러 워커 프로세스가 같은 키의 재시도를 나눠 받아도 한 번만 처리되도록 DB 모드에서 사용합니다.
+    """
+    __tablename__ = "idempotency_record"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256(user_id, scope, Idempotency-Key)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)  # 요청 본문 해시, 같은 키의 다른 요청을 거절하는 데 씀
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # pending / done
+    response: Mapped[str | None] = mapped_column(Text, nullable=True)  # 응답 JSON
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from memory.app.idempotency.errors import (
+    InvalidIdempotencyKeyError, IdempotentRequestInProgressError, IdempotencyKeyReusedError,
+)
+from memory.app.idempotency.store import IdempotencyStore, DONE
+from memory.common.metrics import METRICS
+from memory.database.settings import IDEMPOTENCY_SETTINGS
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """요청 본문을 나타내는 값들의 해시. 같은 Idempotency-Key 로 다른 요청을 보냈는지 확인하는 데 씁니다."""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, default=str).encode()).hexdigest()
+
+
+class IdempotencyCache:
+    """
+    Idempotency-Key 헤더가 붙은 요청의 응답을 TTL 동안 보관했다가, 같은 키로 재시도하면 그대로 돌려줍니다.
+    첫 요청이 아직 처리 중일 때 들어온 재시도는 새로 처리하지 않고 그 결과를 기다립니다.
+    첫 요청이 실패하면 기록을 남기지 않으므로 재시도가 다시 처리됩니다.
+    키마다 요청 fingerprint 를 함께 저장해, 같은 키로 내용이 다른 요청이 오면 422 로 거절합니다.
+    backend=db 이면 idempotency_record 테이블로 다른 워커 프로세스와도 선점/결과를 공유합니다.
+    """
+
+    def __init__(self):
+        self.store = IdempotencyStore()
+        self._results: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()
+        self._inflight: dict[str, tuple[str, asyncio.Future]] = {}
+        self._last_purge = time.monotonic()
+
+    async def run(
+        self,
+        idempotency_key: str | None,
+        user_id: int,
+        scope: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[M]],
+        response_model: type[M],
+    ) -> M:
+        """
+        scope 는 엔드포인트(와 경로 파라미터)를 나타내며, 같은 키라도 사용자나 scope 가 다르면 별개로 처리합니다.
+        fingerprint 는 request_fingerprint() 로 만든 요청 본문의 해시입니다.
+        """
+        if idempotency_key is None:
+            return await handler()
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_SETTINGS.max_key_length:
+            raise InvalidIdempotencyKeyError()
+
+        key = hashlib.sha256(f"{user_id}\0{scope}\0{idempotency_key}".encode()).hexdigest()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + IDEMPOTENCY_SETTINGS.wait_timeout
+
+        while True:
+            payload = self._get_cached(key, fingerprint)
+            if payload is not None:
+                METRICS.incr("idempotency.replayed")
+                return response_model.model_validate(payload)
+            inflight_entry = self._inflight.get(key)
+            if inflight_entry is None:
+                break
+            inflight_fingerprint, inflight = inflight_entry
+            if inflight_fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError()
+            METRICS.incr("idempotency.waited")
+            try:
+                await asyncio.wait_for(asyncio.shield(inflight), max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                raise IdempotentRequestInProgressError()
+
+        future = loop.create_future()
+        self._inflight[key] = (fingerprint, future)
+        claimed = False
+        try:
+            if IDEMPOTENCY_SETTINGS.backend == "db":
+                payload = await self._claim(key, fingerprint, deadline)
+                if payload is not None:
+                    METRICS.incr("idempotency.replayed")
+                    self._remember(key, fingerprint, payload)
+                    return response_model.model_validate(payload)
+                claimed = True
+
+            result = await handler()
+            payload = result.model_dump(mode="json")
+            self._remember(key, fingerprint, payload)
+            if claimed:
+                await self.store.complete(key, json.dumps(payload, ensure_ascii=False), IDEMPOTENCY_SETTINGS.ttl)
+            return result
+        except BaseException:
+            if claimed:
+                await asyncio.shield(self.store.release(key))
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            # 기다리던 재시도들은 깨어나 캐시를 다시 확인하고, 실패했으면 그중 하나가 다시 처리합니다.
+            future.set_result(None)
+
+    async def _claim(self, key: str, fingerprint: str, deadline: float) -> dict | None:
+        """
+        DB 에서 key 를 선점하면 None, 다른 워커가 이미 처리했다면 그 응답을 반환합니다.
+        다른 워커가 처리 중이면 끝날 때까지 poll_interval 마다 확인합니다.
+        """
+        loop = asyncio.get_running_loop()
+        if time.monotonic() - self._last_purge > IDEMPOTENCY_SETTINGS.ttl:
+            self._last_purge = time.monotonic()
+            await self.store.purge_expired()
+
+        while True:
+            record = await self.store.claim(key, fingerprint, IDEMPOTENCY_SETTINGS.pending_timeout)
+            if record is None:
+                return None
+            # fingerprint 가 없는 기록은 컬럼이 생기기 전에 저장된 것
+            if record.fingerprint is not None and record.fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError()
+            if record.status == DONE:
+                return json.loads(record.response)
+            if loop.time() >= deadline:
+                raise IdempotentRequestInProgressError()
+            METRICS.incr("idempotency.waited_remote")
+            await asyncio.sleep(IDEMPOTENCY_SETTINGS.poll_interval)
+
+    def _get_cached(self, key: str, fingerprint: str) -> dict | None:
+        cached = self._results.get(key)
+        if cached is None:
+            return None
+        expires_at, cached_fingerprint, payload = cached
+        if expires_at < time.monotonic():
+            del self._results[key]
+            return None
+        if cached_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError()
+        return payload
+
+    def _remember(self, key: str, fingerprint: str, payload: dict) -> None:
+        self._results[key] = (time.monotonic() + IDEMPOTENCY_SETTINGS.ttl, fingerprint, payload)
+        self._results.move_to_end(key)
+        while len(self._results) > IDEMPOTENCY_SETTINGS.cache_size:
+            self._results.popitem(last=False)
+
+
+IDEMPOTENCY = IdempotencyCache()
@@ -0,0 +1,74 @@
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from memory.app.idempotency.models import IdempotencyRecord
+from memory.database.annotation import transactional
+from memory.database.connection import SESSION
+
+PENDING = "pending"
+DONE = "done"
+
+class IdempotencyStore:
+    @transactional
+    async def claim(self, key: str, fingerprint: str, pending_timeout: int) -> Optional[IdempotencyRecord]:
+        """
+        key 를 pending 으로 선점하고 요청 fingerprint 를 함께 저장합니다. 선점에 성공하면 None, 이미 있으면 기존 기록을 반환합니다.
+        만료된 기록(끝났거나, 처리하던 워커가 죽은 pending)은 지우고 다시 선점합니다.
+        """
+        now = datetime.now(timezone.utc)
+        while True:
+            SESSION.add(IdempotencyRecord(
+                key=key,
+                fingerprint=fingerprint,
+                status=PENDING,
+                expires_at=now + timedelta(seconds=pending_timeout),
+            ))
+            try:
+                await SESSION.flush()
+                return None
+            except IntegrityError:
+                await SESSION.rollback()
+
+            expired = await SESSION.execute(
+                delete(IdempotencyRecord)
+                .where(IdempotencyRecord.key == key, IdempotencyRecord.expires_at < now)
+            )
+            if expired.rowcount == 0:
+                record = await SESSION.get(IdempotencyRecord, key, populate_existing=True)
+                if record is not None:
+                    return record
+            # 만료된 기록을 지웠거나 그 사이에 사라졌으면 다시 선점을 시도
+
+    @transactional
+    async def get_record(self, key: str) -> Optional[IdempotencyRecord]:
+        return await SESSION.get(IdempotencyRecord, key, populate_existing=True)
+
+    @transactional
+    async def complete(self, key: str, response: str, ttl: int) -> None:
+        await SESSION.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key)
+            .values(
+                status=DONE,
+                response=response,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+            )
+        )
+
+    @transactional
+    async def release(self, key: str) -> None:
+        """처리에 실패한 요청의 선점을 풀어, 재시도가 다시 처리될 수 있게 합니다."""
+        await SESSION.execute(
+            delete(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key, IdempotencyRecord.status == PENDING)
+        )
+
+    @transactional
+    async def purge_expired(self) -> int:
+        result = await SESSION.execute(
+            delete(IdempotencyRecord)
+            .where(IdempotencyRecord.expires_at < datetime.now(timezone.utc))
+        )
+        return result.rowcount
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class PresignedUploadRequest(BaseModel):
+    content_type: str
+
+class ImageFinalizeRequest(BaseModel):
+    file_key: str
+    query: Optional[str] = None
+    keyword: Optional[str] = None
@@ -1,18 +1,34 @@
 from typing import Self
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 from memory.app.image.models import Image
+from memory.common.s3_client import PRESIGNED_URLS
 
 class URLResponse(BaseModel):
     file_url : str
+    file_key : str
 
     @staticmethod
-    def from_image(file_url: str) -> "URLResponse":
+    def from_image(file_key: str) -> "URLResponse":
         return URLResponse(
-            file_url=file_url
+            file_url=PRESIGNED_URLS.get_url(file_key),
+            file_key=file_key,
         )
     
+class PresignedPostResponse(BaseModel):
+    url: str
+    fields: dict[str, str]
+    file_key: str
+
+    @staticmethod
+    def from_presigned_post(file_key: str, presigned_post: dict) -> "PresignedPostResponse":
+        return PresignedPostResponse(
+            url=presigned_post["url"],
+            fields=presigned_post["fields"],
+            file_key=file_key,
+        )
+
 class ImageProfileResponse(BaseModel):
     id: int
     file_url: str
@@ -20,14 +36,27 @@ class ImageProfileResponse(BaseModel):
     user_id: Optional[int] = None
     is_main: bool
     content: Optional[str] = None
+    story_status: str = "done"
+    story_version: int = 1
 
     @staticmethod
     def from_image(image: Image) -> "ImageProfileResponse":
         return ImageProfileResponse(
             id=image.id,
-            file_url=image.file_url,
+            file_url=PRESIGNED_URLS.get_url(image.file_key),
             chapter_id=image.chapter_id,
             user_id=image.user_id,
             is_main=image.is_main,
             content=image.content,
-        )
\ No newline at end of file
+            story_status=image.story_status,
+            story_version=image.story_version,
+        )
+
+class ImageListResponse(BaseModel):
+    images: List[ImageProfileResponse]
+
+    @staticmethod
+    def from_images(images: List[Image]) -> "ImageListResponse":
+        return ImageListResponse(
+            images=[ImageProfileResponse.from_image(image) for image in images]
+        )
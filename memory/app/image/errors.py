@@ -0,0 +1,24 @@
+import math
+
+from memory.common.errors import MysolHTTPException
+
+class UnsupportedImageTypeError(MysolHTTPException):
+    def __init__(self, message: str = "지원하지 않는 이미지 형식입니다.") -> None:
+        super().__init__(status_code=400, detail=message)
+
+class InvalidImageKeyError(MysolHTTPException):
+    def __init__(self, message: str = "올바르지 않은 이미지 key 입니다.") -> None:
+        super().__init__(status_code=400, detail=message)
+
+class ForeignImageKeyError(MysolHTTPException):
+    def __init__(self, message: str = "다른 사용자가 업로드한 이미지 key 입니다.") -> None:
+        super().__init__(status_code=403, detail=message)
+
+class ImageNotUploadedError(MysolHTTPException):
+    def __init__(self, message: str = "업로드된 이미지를 찾을 수 없습니다.") -> None:
+        super().__init__(status_code=404, detail=message)
+
+class StoryGenerationUnavailableError(MysolHTTPException):
+    def __init__(self, retry_after: float, message: str = "스토리 생성 서비스가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해 주세요.") -> None:
+        super().__init__(status_code=503, detail=message)
+        self.headers = {"Retry-After": str(math.ceil(retry_after))}
@@ -12,12 +12,16 @@ class Image(Base):
     __tablename__ = "image"
 
     id: Mapped[intpk]
-    file_url: Mapped[str] = mapped_column(Text, nullable=False)
+    file_key: Mapped[str] = mapped_column(Text, nullable=False)  # S3 object key
     chapter_id: Mapped[int | None] = mapped_column(ForeignKey("chapter.id", ondelete="CASCADE"), nullable=True)
     user_id: Mapped[int | None] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=True)
     is_main: Mapped[bool] = mapped_column(default=False)
 
     content : Mapped[str | None] = mapped_column(Text, nullable = True)
+    # 스토리 생성 상태: pending(비동기 작업 대기/진행 중), draft(초안 저장, 고품질 재생성 대기), done, failed
+    story_status: Mapped[str] = mapped_column(String(20), default="done", server_default="done")
+    # 백그라운드 작업이 content 를 바꿀 때마다 증가. 클라이언트는 값이 바뀌면 다시 불러옴
+    story_version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
 
     chapter: Mapped["Chapter"] = relationship(
         "Chapter",
@@ -28,4 +32,21 @@ class Image(Base):
         "User",
         back_populates="main_image",
         foreign_keys=[user_id],
-    )
\ No newline at end of file
+    )
+
+class StoredObject(Base):
+    """
+    사용자별로 내용(SHA-256) 기준으로 S3 에 저장된 객체 목록.
+    같은 사용자가 같은 사진을 다시 올리면 S3 HEAD 없이 이 테이블 조회 한 번으로 기존 객체를 재사용합니다.
+    다른 사용자의 객체 key 가 노출되지 않도록 중복 제거 범위는 사용자 안으로 한정합니다.
+    """
+    __tablename__ = "stored_object"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    file_key: Mapped[str] = mapped_column(Text, nullable=False)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    model_key: Mapped[str | None] = mapped_column(Text, nullable=True)  # 모델 입력용 축소본 key
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,66 @@
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from PIL import Image as PILImage, ImageOps
+
+from memory.database.settings import IMAGE_SETTINGS
+
+MODEL_IMAGE_CONTENT_TYPE = "image/jpeg"
+
+
+def downscale_image(data: bytes, max_edge: int, quality: int) -> bytes:
+    """
+    사진을 디코딩해 EXIF 방향대로 회전하고, 긴 변이 max_edge 를 넘지 않도록 줄인 JPEG 를 반환합니다.
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 둡니다.
+    """
+    with PILImage.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((max_edge, max_edge))
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue()
+
+
+class ImagePreprocessPool:
+    """이벤트 루프를 막지 않도록 디코딩/리사이즈를 별도 프로세스에서 수행합니다."""
+
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=IMAGE_SETTINGS.preprocess_workers)
+        return self._executor
+
+    async def downscale(self, data: bytes) -> bytes:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(
+                executor,
+                partial(
+                    downscale_image,
+                    data,
+                    IMAGE_SETTINGS.model_max_edge,
+                    IMAGE_SETTINGS.model_jpeg_quality,
+                ),
+            )
+        except BrokenProcessPool:
+            # 워커 프로세스가 죽으면 풀 전체가 쓸 수 없게 되므로 다음 호출에서 새로 만듦
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+PREPROCESS_POOL = ImagePreprocessPool()
@@ -1,11 +1,56 @@
 # memory/app/image/service.py
 
+import base64
+import uuid
+from dataclasses import dataclass
+from loguru import logger
 from fastapi import File, UploadFile, Depends, HTTPException
 from botocore.exceptions import ClientError
+from memory.app.image.models import StoredObject
 from memory.app.image.store import ImageStore
-from memory.app.image.dto.responses import URLResponse
+from memory.app.image.dto.responses import URLResponse, PresignedPostResponse
+from memory.app.image.preprocess import PREPROCESS_POOL, MODEL_IMAGE_CONTENT_TYPE
+from memory.common.concurrency import gather_or_cancel
+from memory.common.s3_client import PRESIGNED_URLS
+from memory.database.settings import IMAGE_SETTINGS
+from memory.app.image.errors import (
+    UnsupportedImageTypeError, InvalidImageKeyError, ForeignImageKeyError, ImageNotUploadedError,
+)
 from typing import Annotated
 
+UPLOAD_PREFIX = "uploads/"
+MODEL_VARIANT_PREFIX = "model/"
+
+def user_upload_prefix(user_id: int) -> str:
+    """사용자가 직접 올린 객체의 key 접두사. key 만 보고 업로드한 사용자를 확인할 수 있게 합니다."""
+    return f"{UPLOAD_PREFIX}{user_id}/"
+
+@dataclass
+class ModelImage:
+    """
+    비전 모델에 넘길 이미지. 방금 만든 축소본처럼 바이트가 메모리에 있으면 data 에 담아 둡니다.
+    """
+    key: str
+    content_type: str
+    data: bytes | None = None
+
+    @property
+    def is_inline(self) -> bool:
+        return (
+            self.data is not None
+            and IMAGE_SETTINGS.transport == "auto"
+            and len(self.data) <= IMAGE_SETTINGS.inline_max_bytes
+        )
+
+    def url(self) -> str:
+        """
+        image_url 블록에 넣을 URL. 작은 축소본은 base64 data URL 로 직접 보내
+        OpenAI 가 S3 에서 내려받는 왕복(과 presigned URL 만료 문제)을 없앱니다.
+        """
+        if self.is_inline:
+            return f"data:{self.content_type};base64,{base64.b64encode(self.data).decode()}"
+        return PRESIGNED_URLS.get_url(self.key)
+
 class ImageService:
     def __init__(
         self,
@@ -15,11 +60,127 @@ class ImageService:
 
     async def upload_image(
         self,
-        s3_path: str,
+        user_id: int,
         file: UploadFile = File(...)
     ) -> URLResponse:
+        """
+        업로드하면서 내용 해시(SHA-256)를 계산합니다.
+        같은 사용자가 같은 내용을 이미 올렸으면 객체를 새로 만들지 않고 기존 객체를 재사용합니다.
+        """
+        url_resp, _ = await self._upload(user_id, file, prepare_model_image=False)
+        return url_resp
+
+    async def upload_image_for_story(
+        self,
+        user_id: int,
+        file: UploadFile,
+    ) -> tuple[URLResponse, ModelImage]:
+        """
+        원본 업로드와 비전 모델용 축소본 생성을 동시에 진행합니다.
+        (원본 응답, 모델 입력 이미지) 를 반환합니다.
+        축소가 비활성화되어 있거나 디코딩할 수 없는 형식이면 원본을 모델 입력으로 사용합니다.
+        """
+        return await self._upload(user_id, file, prepare_model_image=IMAGE_SETTINGS.preprocess_enabled)
+
+    async def _upload(
+        self,
+        user_id: int,
+        file: UploadFile,
+        prepare_model_image: bool,
+    ) -> tuple[URLResponse, ModelImage]:
+        # 해시는 업로드하면서 계산하므로 key 는 uuid 로 정하고, 내용 → key 대응은 stored_object 에 기록
+        new_key = f"{user_upload_prefix(user_id)}{uuid.uuid4()}"
+        stored: StoredObject | None = None
+
+        async def find_existing(sha256: str) -> str | None:
+            nonlocal stored
+            stored = await self.image_store.get_stored_object(user_id, sha256)
+            return stored.file_key if stored is not None else None
+
+        data = await self._read_for_preprocess(file) if prepare_model_image else None
+
+        async def upload_original() -> tuple[str, str, int]:
+            try:
+                return await self.image_store.upload_image_in_S3(new_key, file, find_existing)
+            except ClientError:
+                raise HTTPException(500, detail="이미지 업로드에 실패했습니다.")
+
+        async def downscale() -> bytes | None:
+            nonlocal data
+            if data is None:
+                return None
+            try:
+                variant = await PREPROCESS_POOL.downscale(data)
+            except Exception as e:
+                # 디코딩 불가, 압축 폭탄, 프로세스 풀 장애 등 어떤 이유든 축소에 실패하면 원본을 모델 입력으로 사용
+                logger.warning(f"이미지 축소 실패, 원본 사용: {new_key} ({type(e).__name__}: {e})")
+                variant = None
+            # 업로드가 끝나기 전에 원본 바이트를 놓음. 축소에 실패했고 인라인 전송할 만큼 작을 때만 들고 있음
+            if variant is not None or len(data) > IMAGE_SETTINGS.inline_max_bytes:
+                data = None
+            return variant
+
+        (file_key, sha256, size), variant = await gather_or_cancel(upload_original(), downscale())
+        if stored is not None:
+            logger.info(f"중복 업로드, 기존 객체 재사용: {file_key}")
+        else:
+            await self.image_store.add_stored_object(user_id, sha256, file_key, file.content_type, size)
+
+        url_resp = URLResponse.from_image(file_key)
+        if prepare_model_image and stored is not None and stored.model_key is not None:
+            # 같은 내용의 축소본이 이미 있으면 재사용
+            return url_resp, ModelImage(stored.model_key, MODEL_IMAGE_CONTENT_TYPE)
+        if variant is None:
+            # 축소본 없이 원본을 쓰는 경우: 디코딩에 실패했어도 읽어 둔 원본 바이트는 인라인 전송에 쓸 수 있음
+            return url_resp, ModelImage(file_key, file.content_type, data)
+
+        variant_key = f"{MODEL_VARIANT_PREFIX}{file_key}.jpg"
         try:
-            file_url = await self.image_store.upload_image_in_S3(s3_path, file)
+            await self.image_store.put_bytes(variant_key, variant, MODEL_IMAGE_CONTENT_TYPE)
         except ClientError:
             raise HTTPException(500, detail="이미지 업로드에 실패했습니다.")
-        return URLResponse.from_image(file_url)
+        await self.image_store.set_model_key(user_id, sha256, variant_key)
+        logger.info(f"모델 입력용 축소본 생성: {file_key} {size}B -> {len(variant)}B")
+        return url_resp, ModelImage(variant_key, MODEL_IMAGE_CONTENT_TYPE, variant)
+
+    async def _read_for_preprocess(self, file: UploadFile) -> bytes | None:
+        """
+        축소본을 만들 원본 바이트를 preprocess_max_bytes 까지만 읽습니다.
+        그보다 큰 파일은 메모리에 올리지 않고 None 을 반환해 원본을 모델 입력으로 쓰게 합니다.
+        """
+        limit = IMAGE_SETTINGS.preprocess_max_bytes
+        data = await file.read(limit + 1)
+        await file.seek(0)
+        if len(data) > limit:
+            logger.info(f"축소 대상 크기 초과, 원본 사용: {file.filename} (> {limit}B)")
+            return None
+        return data
+
+    async def create_upload_policy(self, user_id: int, content_type: str) -> PresignedPostResponse:
+        """
+        브라우저 → S3 직접 업로드용 presigned POST 를 발급합니다.
+        key 는 서버가 uploads/{user_id}/{uuid} 로 정해서 내려주므로, finalize 에서 업로드한 사용자를 확인할 수 있습니다.
+        """
+        if not content_type.startswith("image/"):
+            raise UnsupportedImageTypeError()
+
+        file_key = f"{user_upload_prefix(user_id)}{uuid.uuid4()}"
+        try:
+            presigned_post = await self.image_store.create_presigned_post(file_key, content_type)
+        except ClientError:
+            raise HTTPException(500, detail="업로드 URL 발급에 실패했습니다.")
+        return PresignedPostResponse.from_presigned_post(file_key, presigned_post)
+
+    async def get_uploaded_content_type(self, user_id: int, file_key: str) -> str:
+        """
+        직접 업로드가 끝난 key 를 검증하고 Content-Type 을 반환합니다.
+        다른 사용자의 업로드 key 로는 이미지를 만들 수 없습니다.
+        """
+        if not file_key.startswith(UPLOAD_PREFIX) or ".." in file_key:
+            raise InvalidImageKeyError()
+        if not file_key.startswith(user_upload_prefix(user_id)):
+            raise ForeignImageKeyError()
+        try:
+            return await self.image_store.get_object_content_type(file_key)
+        except ClientError:
+            raise ImageNotUploadedError()
@@ -0,0 +1,140 @@
+import asyncio
+from dataclasses import dataclass, field
+from loguru import logger
+
+from memory.app.image.service import ModelImage
+from memory.common.metrics import METRICS
+from memory.common.openai_service import generate_continuous_story
+from memory.database.settings import IMAGE_SETTINGS
+
+
+@dataclass
+class _Speculation:
+    task: asyncio.Task
+    model: str
+    keyword: str | None
+    query: str | None
+    context: tuple[str | None, tuple[str, ...]]
+    expire_handle: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+
+class SpeculativeStories:
+    """
+    /upload 에 챕터 힌트가 있으면 /create 요청이 오기 전에 스토리 생성을 미리 시작해 두는 저장소.
+    (사용자, 챕터, 파일 key) 로 보관하고, /create 가 같은 사진·챕터에 대해 모델·keyword·query·챕터 컨텍스트가
+    모두 같을 때만 진행 중이거나 끝난 결과를 넘겨줍니다. 다르거나 speculative_ttl 동안 찾지 않으면 버립니다.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[int, int, str], _Speculation] = {}
+        self._started = 0
+        self._hits = 0
+        self._wasted = 0
+
+    def start(
+        self,
+        user_id: int,
+        chapter_id: int,
+        file_key: str,
+        model_image: ModelImage,
+        summary: str | None,
+        previous_stories: list[str],
+        keyword: str | None,
+        query: str | None,
+        model: str,
+    ) -> bool:
+        key = (user_id, chapter_id, file_key)
+        if key in self._entries:
+            # 같은 사진을 다시 올린 경우: 이전 추측은 새 파라미터로 대체
+            self._discard(key, "replaced")
+        if len(self._entries) >= IMAGE_SETTINGS.speculative_max_pending:
+            METRICS.incr("speculative.skipped")
+            return False
+
+        task = asyncio.create_task(
+            generate_continuous_story(
+                previous_stories=previous_stories,
+                summary=summary,
+                file_url=model_image.url(),
+                content_type=model_image.content_type,
+                keywords=keyword,
+                user_query=query,
+                user_id=user_id,
+                model=model,
+            ),
+            name=f"speculative-story-{file_key}",
+        )
+        # 결과를 아무도 가져가지 않아도 "exception was never retrieved" 경고가 남지 않도록 함
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        entry = _Speculation(task, model, keyword or None, query or None, (summary, tuple(previous_stories)))
+        entry.expire_handle = asyncio.get_running_loop().call_later(
+            IMAGE_SETTINGS.speculative_ttl, self._expire, key, entry
+        )
+        self._entries[key] = entry
+        self._started += 1
+        METRICS.incr("speculative.started")
+        self._update_gauges()
+        return True
+
+    def take(
+        self,
+        user_id: int,
+        chapter_id: int,
+        file_key: str,
+        summary: str | None,
+        previous_stories: list[str],
+        keyword: str | None,
+        query: str | None,
+        model: str,
+    ) -> asyncio.Task | None:
+        """
+        조건이 맞는 추측 생성 작업을 꺼내 반환합니다 (이후 소유권은 호출자에게 있음).
+        없거나 조건이 다르면 None 을 반환하고, 다른 추측은 버립니다.
+        """
+        key = (user_id, chapter_id, file_key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (entry.model, entry.keyword, entry.query) != (model, keyword or None, query or None):
+            self._discard(key, "mismatch")
+            return None
+        if entry.context != (summary, tuple(previous_stories)):
+            # 업로드 이후 챕터에 다른 스토리가 추가됨
+            self._discard(key, "stale")
+            return None
+
+        del self._entries[key]
+        entry.expire_handle.cancel()
+        self._hits += 1
+        METRICS.incr("speculative.hit")
+        METRICS.incr("speculative.hit.done" if entry.task.done() else "speculative.hit.inflight")
+        self._update_gauges()
+        return entry.task
+
+    async def stop(self) -> None:
+        tasks = [entry.task for entry in self._entries.values()]
+        for key in list(self._entries):
+            self._discard(key, "shutdown")
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _expire(self, key: tuple[int, int, str], entry: _Speculation) -> None:
+        if self._entries.get(key) is entry:
+            self._discard(key, "expired")
+
+    def _discard(self, key: tuple[int, int, str], reason: str) -> None:
+        entry = self._entries.pop(key)
+        entry.expire_handle.cancel()
+        entry.task.cancel()
+        self._wasted += 1
+        METRICS.incr(f"speculative.wasted.{reason}")
+        logger.info(f"추측 생성 결과 버림: user={key[0]} chapter={key[1]} key={key[2]} reason={reason}")
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        METRICS.set_gauge("speculative.pending", len(self._entries))
+        if self._started:
+            METRICS.set_gauge("speculative.hit_rate", round(self._hits / self._started, 4))
+            METRICS.set_gauge("speculative.waste_rate", round(self._wasted / self._started, 4))
+
+
+SPECULATIVE_STORIES = SpeculativeStories()
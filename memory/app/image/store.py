@@ -1,46 +1,265 @@
 # memory/app/image/store.py
 
-import aioboto3
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Optional
 from fastapi import File, UploadFile
-from memory.database.settings import AWSSettings
-
-AWS_SETTINGS = AWSSettings()
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from memory.app.image.models import Image, StoredObject
+from memory.common.s3_client import S3_CLIENT
+from memory.database.annotation import transactional, retry_on_disconnect
+from memory.database.connection import SESSION
+from memory.database.settings import AWS_SETTINGS
 
 class ImageStore:
+    @retry_on_disconnect
+    @transactional
+    async def get_image(self, image_id: int) -> Optional[Image]:
+        return await SESSION.get(Image, image_id)
+
+    @transactional
+    async def add_image(
+        self,
+        user_id: int,
+        chapter_id: int,
+        file_key: str,
+        content: str | None = None,
+        story_status: str = "done",
+    ) -> Image:
+        image = Image(
+            file_key=file_key,
+            chapter_id=chapter_id,
+            user_id=user_id,
+            is_main=False,
+            content=content,
+            story_status=story_status,
+        )
+        SESSION.add(image)
+        await SESSION.flush()
+        return image
+
+    @transactional
+    async def add_images(self, user_id: int, chapter_id: int, items: list[tuple[str, str]]) -> list[Image]:
+        """
+        (file_key, content) 목록을 순서대로 한 번의 flush 로 저장합니다.
+        """
+        images = [
+            Image(
+                file_key=file_key,
+                chapter_id=chapter_id,
+                user_id=user_id,
+                is_main=False,
+                content=content,
+            )
+            for file_key, content in items
+        ]
+        SESSION.add_all(images)
+        await SESSION.flush()
+        return images
+
+    @transactional
+    async def save_story(self, image_id: int, content: str | None, story_status: str) -> None:
+        await SESSION.execute(
+            update(Image)
+            .where(Image.id == image_id)
+            .values(content=content, story_status=story_status)
+        )
+
+    @retry_on_disconnect
+    @transactional
+    async def get_stored_object(self, user_id: int, sha256: str) -> Optional[StoredObject]:
+        return await SESSION.get(StoredObject, (user_id, sha256))
+
+    @transactional
+    async def add_stored_object(
+        self, user_id: int, sha256: str, file_key: str, content_type: str | None, size: int,
+    ) -> None:
+        SESSION.add(StoredObject(
+            user_id=user_id,
+            sha256=sha256,
+            file_key=file_key,
+            content_type=content_type,
+            size=size,
+        ))
+        try:
+            await SESSION.flush()
+        except IntegrityError:
+            # 같은 내용이 동시에 업로드된 경우: 객체는 이미 같은 key 로 올라가 있으므로 무시
+            await SESSION.rollback()
+
+    @transactional
+    async def set_model_key(self, user_id: int, sha256: str, model_key: str) -> None:
+        await SESSION.execute(
+            update(StoredObject)
+            .where(StoredObject.user_id == user_id, StoredObject.sha256 == sha256)
+            .values(model_key=model_key)
+        )
+
     async def upload_image_in_S3(
         self,
         s3_path: str,
-        file: UploadFile = File(...)
-    ) -> str:
-        # 1) 바이트로 읽기
-        body = await file.read()
-
-        # 2) aioboto3 세션 열기
-        session = aioboto3.Session()
-        async with session.client(
-            "s3",
-            aws_access_key_id=AWS_SETTINGS.access_key_id,
-            aws_secret_access_key=AWS_SETTINGS.secret_access_key,
-            region_name=AWS_SETTINGS.default_region,
-        ) as s3_client:
-            # 3) private 모드로 업로드
-            await s3_client.put_object(
+        file: UploadFile = File(...),
+        find_existing: Callable[[str], Awaitable[str | None]] | None = None,
+    ) -> tuple[str, str, int]:
+        """
+        업로드하면서 SHA-256 을 함께 계산해 (key, sha256, size) 를 반환합니다.
+        find_existing 은 내용을 다 읽은 뒤 객체를 만들기 직전에 sha256 으로 호출되며,
+        같은 내용의 기존 key 를 돌려주면 업로드를 건너뛰고(멀티파트면 abort) 그 key 를 반환합니다.
+        """
+        # 1) 첫 파트만큼만 읽기 (파일 전체를 메모리에 올리지 않음)
+        part_size = AWS_SETTINGS.s3_multipart_part_size
+        first_chunk = await file.read(part_size)
+
+        # 2) 앱 전체에서 공유하는 S3 클라이언트 사용
+        s3_client = await S3_CLIENT.get_client()
+
+        # 3) private 모드로 업로드
+        #    파트 크기보다 작은 파일은 put_object 한 번, 그 외에는 멀티파트로 스트리밍
+        if len(first_chunk) >= part_size:
+            return await self._upload_multipart(s3_client, s3_path, file, first_chunk, find_existing)
+
+        sha256 = hashlib.sha256(first_chunk).hexdigest()
+        existing = await find_existing(sha256) if find_existing is not None else None
+        if existing is not None:
+            return existing, sha256, len(first_chunk)
+        await s3_client.put_object(
+            Bucket=AWS_SETTINGS.s3_bucket,
+            Key=s3_path,
+            Body=first_chunk,
+            ContentType=file.content_type,
+            # ACL 옵션은 생략 → 기본 private
+        )
+
+        # 4) 호출자에게 S3 key 반환 (presigned URL 은 조회 시점에 생성)
+        return s3_path, sha256, len(first_chunk)
+
+    async def put_bytes(self, s3_path: str, body: bytes, content_type: str) -> str:
+        """이미 메모리에 있는 작은 객체(축소본 등)를 업로드하고 key 를 반환합니다."""
+        s3_client = await S3_CLIENT.get_client()
+        await s3_client.put_object(
+            Bucket=AWS_SETTINGS.s3_bucket,
+            Key=s3_path,
+            Body=body,
+            ContentType=content_type,
+        )
+        return s3_path
+
+    async def create_presigned_post(self, s3_path: str, content_type: str) -> dict:
+        """
+        브라우저가 S3 로 직접 업로드할 수 있도록 presigned POST 정책을 생성합니다.
+        key, Content-Type, 최대 크기를 정책에 고정합니다.
+        """
+        s3_client = await S3_CLIENT.get_client()
+        return await s3_client.generate_presigned_post(
+            Bucket=AWS_SETTINGS.s3_bucket,
+            Key=s3_path,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, AWS_SETTINGS.s3_upload_max_bytes],
+            ],
+            ExpiresIn=AWS_SETTINGS.s3_presign_post_expires_in,
+        )
+
+    async def get_object_content_type(self, s3_path: str) -> str:
+        """업로드된 객체를 확인하고 Content-Type 을 반환합니다. 없으면 ClientError."""
+        s3_client = await S3_CLIENT.get_client()
+        head = await s3_client.head_object(
+            Bucket=AWS_SETTINGS.s3_bucket,
+            Key=s3_path,
+        )
+        return head["ContentType"]
+
+    async def _upload_multipart(
+        self,
+        s3_client,
+        s3_path: str,
+        file: UploadFile,
+        first_chunk: bytes,
+        find_existing: Callable[[str], Awaitable[str | None]] | None,
+    ) -> tuple[str, str, int]:
+        """
+        UploadFile 을 파트 단위로 읽어 멀티파트 업로드하면서 해시를 이어서 계산합니다.
+        세마포어를 얻은 뒤에만 다음 파트를 읽으므로 메모리 사용량은 대략 파트 크기 × 동시성으로 제한됩니다.
+        실패하거나 같은 내용의 기존 객체가 있으면 멀티파트 업로드를 abort 해서 미완성 파트가 남지 않게 합니다.
+        """
+        part_size = AWS_SETTINGS.s3_multipart_part_size
+        semaphore = asyncio.Semaphore(AWS_SETTINGS.s3_multipart_concurrency)
+
+        upload = await s3_client.create_multipart_upload(
+            Bucket=AWS_SETTINGS.s3_bucket,
+            Key=s3_path,
+            ContentType=file.content_type,
+        )
+        upload_id = upload["UploadId"]
+
+        async def upload_part(part_number: int, chunk: bytes) -> dict:
+            try:
+                resp = await s3_client.upload_part(
+                    Bucket=AWS_SETTINGS.s3_bucket,
+                    Key=s3_path,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                )
+                return {"PartNumber": part_number, "ETag": resp["ETag"]}
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task] = []
+
+        async def abort() -> None:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await s3_client.abort_multipart_upload(
+                    Bucket=AWS_SETTINGS.s3_bucket,
+                    Key=s3_path,
+                    UploadId=upload_id,
+                )
+            except Exception:
+                pass
+
+        hasher = hashlib.sha256(first_chunk)
+        size = len(first_chunk)
+        try:
+            await semaphore.acquire()
+            chunk, part_number = first_chunk, 1
+            while chunk:
+                tasks.append(asyncio.create_task(upload_part(part_number, chunk)))
+                chunk = None
+
+                await semaphore.acquire()
+                # 이미 실패한 파트가 있으면 나머지를 읽지 않고 바로 중단
+                for task in tasks:
+                    if task.done() and task.exception() is not None:
+                        semaphore.release()
+                        raise task.exception()
+
+                chunk = await file.read(part_size)
+                if not chunk:
+                    semaphore.release()
+                hasher.update(chunk)
+                size += len(chunk)
+                part_number += 1
+
+            # 남은 파트가 올라가는 동안 같은 내용의 객체가 있는지 확인
+            sha256 = hasher.hexdigest()
+            existing = await find_existing(sha256) if find_existing is not None else None
+            if existing is not None:
+                await abort()
+                return existing, sha256, size
+
+            parts = await asyncio.gather(*tasks)
+            await s3_client.complete_multipart_upload(
                 Bucket=AWS_SETTINGS.s3_bucket,
                 Key=s3_path,
-                Body=body,
-                ContentType=file.content_type,
-                # ACL 옵션은 생략 → 기본 private
-            )
-
-            # 4) presigned URL 생성 (예: 1시간 유효)
-            presigned_url = await s3_client.generate_presigned_url(
-                ClientMethod="get_object",
-                Params={
-                    "Bucket": AWS_SETTINGS.s3_bucket,
-                    "Key": s3_path
-                },
-                ExpiresIn=3600,  # 3600초 = 1시간
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
             )
-
-        # 5) 호출자에게 presigned URL 반환
-        return presigned_url
+            return s3_path, sha256, size
+        except BaseException:
+            await abort()
+            raise
@@ -1,25 +1,36 @@
-import uuid
-import aioboto3
+import asyncio
+import contextlib
+import json
+from loguru import logger
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends
-from botocore.exceptions import ClientError
+from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, Query, Header
+from fastapi.responses import StreamingResponse
 from typing import Annotated
-from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from memory.database.settings import AWSSettings
+from memory.database.settings import JOB_SETTINGS, IMAGE_SETTINGS, GPT_SETTINGS
 from memory.app.user.views import get_current_user_from_header
 from memory.app.user.models import User
-from memory.app.image.dto.responses import URLResponse, ImageProfileResponse
-from memory.app.image.service import ImageService
-from memory.app.chapter.service import ChapterService
-from memory.database.connection import SESSION
-from memory.common.openai_service import generate_continuous_story
+from memory.app.image.dto.requests import PresignedUploadRequest, ImageFinalizeRequest
+from memory.app.image.dto.responses import URLResponse, ImageProfileResponse, PresignedPostResponse, ImageListResponse
+from memory.app.image.service import ImageService, ModelImage
+from memory.app.image.errors import StoryGenerationUnavailableError
 from memory.app.image.models import Image
-from memory.app.chapter.models import Chapter
-
-AWS_SETTINGS = AWSSettings()
+from memory.app.image.store import ImageStore
+from memory.app.image.speculative import SPECULATIVE_STORIES
+from memory.app.job.dto.responses import StoryJobResponse
+from memory.app.job.store import JobStore
+from memory.app.job.worker import STORY_JOB_WORKER
+from memory.app.chapter.service import ChapterService
+from memory.app.chapter.summary import CHAPTER_SUMMARIZER
+from memory.app.chapter.bookend import CHAPTER_BOOKENDS
+from memory.app.idempotency.service import IDEMPOTENCY, request_fingerprint
+from memory.database.connection import release_session
+from memory.common.concurrency import gather_or_cancel, StageTimer
+from memory.common.metrics import METRICS
+from memory.common.openai_service import (
+    generate_continuous_story, stream_continuous_story, story_model, is_tiered, CircuitOpenError,
+)
 
 image_router = APIRouter()
 
@@ -27,15 +38,135 @@ image_router = APIRouter()
 async def upload_image(
     user: Annotated[User, Depends(get_current_user_from_header)],
     image_service: Annotated[ImageService, Depends()],
+    chapter_service: Annotated[ChapterService, Depends()],
     file: UploadFile = File(...),
+    chapter_id: Optional[int] = Form(None),
+    query: Optional[str] = Form(None),
+    keyword: Optional[str] = Form(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> URLResponse:
-    unique_filename = f"{uuid.uuid4()}-{file.filename}"
-    s3_path = f"uploads/{unique_filename}"
+    """
+    이미지를 업로드합니다.
+    chapter_id(이 사진을 추가할 챕터)를 함께 보내고 추측 생성이 켜져 있으면 업로드 직후 스토리 생성을 시작해,
+    같은 사진·keyword·query 로 /create/{chapter_id} 를 호출할 때 진행 중이거나 끝난 결과를 이어받습니다.
+    """
+    async def upload() -> URLResponse:
+        # 인증 등에서 쓴 커넥션을 S3 업로드 동안 붙잡지 않도록 먼저 돌려줌
+        await release_session()
+        if chapter_id is None or not IMAGE_SETTINGS.speculative_enabled:
+            return await image_service.upload_image(user_id=user.id, file=file)
 
-    return await image_service.upload_image(
-        s3_path=s3_path,
-        file=file
+        (url_resp, model_image), (summary, previous_stories) = await gather_or_cancel(
+            image_service.upload_image_for_story(user.id, file),
+            chapter_service.get_story_context(chapter_id),
+        )
+        SPECULATIVE_STORIES.start(
+            user_id=user.id,
+            chapter_id=chapter_id,
+            file_key=url_resp.file_key,
+            model_image=model_image,
+            summary=summary,
+            previous_stories=previous_stories,
+            keyword=keyword,
+            query=query,
+            model=story_model("create", draft=is_tiered("create")),
+        )
+        return url_resp
+
+    fingerprint = request_fingerprint(
+        file.filename, file.size, file.content_type, chapter_id, query, keyword,
     )
+    return await IDEMPOTENCY.run(idempotency_key, user.id, "images.upload", fingerprint, upload, URLResponse)
+
+@image_router.post("/upload/presign", status_code=201)
+async def create_upload_policy(
+    user: Annotated[User, Depends(get_current_user_from_header)],
+    image_service: Annotated[ImageService, Depends()],
+    request: PresignedUploadRequest,
+) -> PresignedPostResponse:
+    """
+    브라우저가 S3 로 직접 업로드할 수 있는 presigned POST 를 발급합니다.
+    업로드가 끝나면 file_key 로 /create/{chapter_id}/finalize 를 호출합니다.
+    """
+    return await image_service.create_upload_policy(user_id=user.id, content_type=request.content_type)
+
+async def _generate_and_save(
+    endpoint: str,
+    user: User,
+    chapter_id: int,
+    image_store: ImageStore,
+    job_store: JobStore,
+    timer: StageTimer,
+    file_key: str,
+    model_image: ModelImage,
+    summary: Optional[str],
+    previous_stories: list[str],
+    query: Optional[str],
+    keyword: Optional[str],
+) -> ImageProfileResponse:
+    """
+    스토리를 생성해 Image 로 저장합니다.
+    티어드 모드인 엔드포인트는 초안 모델로 빠르게 만든 스토리를 저장해 돌려주고,
+    엔드포인트의 스토리 모델로 다시 생성하는 작업을 대기열에 넣습니다 (완료되면 story_version 증가).
+    OpenAI 회로 차단기가 열려 있으면 503 을 반환하거나, BREAKER_FALLBACK=defer 면
+    스토리가 빈(pending) Image 를 저장하고 생성은 백그라운드 작업으로 넘깁니다.
+    """
+    tiered = is_tiered(endpoint)
+    model = story_model(endpoint, draft=tiered)
+
+    async def generate() -> str:
+        # /upload 때 미리 시작해 둔 추측 생성이 있으면 그 결과를 이어받음
+        speculation = SPECULATIVE_STORIES.take(
+            user.id, chapter_id, file_key, summary, previous_stories, keyword, query, model,
+        )
+        if speculation is not None:
+            try:
+                return await timer.run("speculative", speculation)
+            except Exception as e:
+                METRICS.incr("speculative.failed")
+                logger.warning(f"추측 생성이 실패해 다시 생성: {file_key} ({e!r})")
+        return await timer.run("generate", generate_continuous_story(
+            previous_stories=previous_stories,
+            summary=summary,
+            file_url=model_image.url(),
+            content_type=model_image.content_type,
+            keywords=keyword,
+            user_query=query,
+            user_id=user.id,
+            model=model,
+        ))
+
+    try:
+        story_text = await generate()
+    except CircuitOpenError as e:
+        if GPT_SETTINGS.BREAKER_FALLBACK != "defer":
+            raise StoryGenerationUnavailableError(e.retry_after) from e
+        story_text = None
+
+    if story_text is None or tiered:
+        image, _ = await timer.run("save", job_store.create_story_job(
+            user_id=user.id,
+            chapter_id=chapter_id,
+            file_key=file_key,
+            model_key=model_image.key,
+            model_content_type=model_image.content_type,
+            keyword=keyword,
+            query=query,
+            draft=story_text,
+            model=story_model(endpoint),
+        ))
+        STORY_JOB_WORKER.notify()
+    else:
+        image = await timer.run("save", image_store.add_image(
+            user_id=user.id,
+            chapter_id=chapter_id,
+            file_key=file_key,
+            content=story_text,
+        ))
+    CHAPTER_SUMMARIZER.schedule(chapter_id)
+    CHAPTER_BOOKENDS.notify(chapter_id)
+
+    return ImageProfileResponse.from_image(image)
 
 @image_router.post("/create/{chapter_id}", status_code=201)
 async def create_image(
@@ -43,46 +174,308 @@ async def create_image(
     chapter_id: int,
     image_service: Annotated[ImageService, Depends()],
     chapter_service: Annotated[ChapterService, Depends()],
+    image_store: Annotated[ImageStore, Depends()],
+    job_store: Annotated[JobStore, Depends()],
     file: UploadFile = File(...),
     query: Optional[str] = Form(None),
-    keyword: Optional[str] = Form(None)
+    keyword: Optional[str] = Form(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> ImageProfileResponse:
-    
-    chapter = await SESSION.get(Chapter, chapter_id)
-    
-    unique_filename = f"{uuid.uuid4()}-{file.filename}"
-    s3_path = f"uploads/{unique_filename}"
-
-    url_resp = await image_service.upload_image(
-        s3_path=s3_path,
-        file=file
+    """
+    업로드(+모델용 축소본 생성)와 챕터 컨텍스트 조회를 동시에 진행한 뒤 스토리를 생성합니다.
+    한 단계라도 실패하면 나머지는 취소됩니다.
+    Idempotency-Key 헤더가 있으면 같은 키의 재시도에는 처음 생성된 결과를 돌려줍니다.
+    """
+    async def create() -> ImageProfileResponse:
+        await release_session()
+        timer = StageTimer("create_image")
+
+        (url_resp, model_image), (summary, previous_stories) = await gather_or_cancel(
+            timer.run("upload", image_service.upload_image_for_story(user.id, file)),
+            timer.run("context", chapter_service.get_story_context(chapter_id)),
+        )
+
+        response = await _generate_and_save(
+            endpoint="create",
+            user=user,
+            chapter_id=chapter_id,
+            image_store=image_store,
+            job_store=job_store,
+            timer=timer,
+            file_key=url_resp.file_key,
+            model_image=model_image,
+            summary=summary,
+            previous_stories=previous_stories,
+            query=query,
+            keyword=keyword,
+        )
+        timer.log(
+            chapter=chapter_id,
+            preprocess=model_image.key != url_resp.file_key,
+            inline=model_image.is_inline,
+        )
+        return response
+
+    fingerprint = request_fingerprint(file.filename, file.size, file.content_type, query, keyword)
+    return await IDEMPOTENCY.run(
+        idempotency_key, user.id, f"images.create:{chapter_id}", fingerprint, create, ImageProfileResponse,
     )
-    file_url: str = url_resp.file_url
 
-    await SESSION.refresh(chapter)
-    previous_stories = [
-        img.content
-        for img in chapter.images
-        if img.content is not None
-    ]
+@image_router.post("/create/{chapter_id}/finalize", status_code=201)
+async def finalize_image(
+    user: Annotated[User, Depends(get_current_user_from_header)],
+    chapter_id: int,
+    image_service: Annotated[ImageService, Depends()],
+    chapter_service: Annotated[ChapterService, Depends()],
+    image_store: Annotated[ImageStore, Depends()],
+    job_store: Annotated[JobStore, Depends()],
+    request: ImageFinalizeRequest,
+) -> ImageProfileResponse:
+    """
+    presigned POST 로 S3 에 직접 업로드된 이미지를 key 로 받아 스토리를 생성합니다.
+    """
+    await release_session()
+    timer = StageTimer("finalize_image")
 
-    story_text = await generate_continuous_story(
+    content_type, (summary, previous_stories) = await gather_or_cancel(
+        timer.run("head", image_service.get_uploaded_content_type(user.id, request.file_key)),
+        timer.run("context", chapter_service.get_story_context(chapter_id)),
+    )
+
+    response = await _generate_and_save(
+        endpoint="finalize",
+        user=user,
+        chapter_id=chapter_id,
+        image_store=image_store,
+        job_store=job_store,
+        timer=timer,
+        file_key=request.file_key,
+        model_image=ModelImage(request.file_key, content_type),
+        summary=summary,
         previous_stories=previous_stories,
-        file_url = file_url,
-        content_type=file.content_type,
-        keywords=keyword,
-        user_query=query,
+        query=request.query,
+        keyword=request.keyword,
+    )
+    timer.log(chapter=chapter_id)
+    return response
+
+@image_router.post("/create/{chapter_id}/batch", status_code=201)
+async def create_images_batch(
+    user: Annotated[User, Depends(get_current_user_from_header)],
+    chapter_id: int,
+    image_service: Annotated[ImageService, Depends()],
+    chapter_service: Annotated[ChapterService, Depends()],
+    image_store: Annotated[ImageStore, Depends()],
+    files: list[UploadFile] = File(...),
+    keywords: Optional[list[str]] = Form(None),
+    queries: Optional[list[str]] = Form(None),
+) -> ImageListResponse:
+    """
+    여러 장의 사진을 한 번에 받아 챕터에 추가합니다.
+    keywords / queries 는 files 와 같은 순서의 선택 값입니다 (빈 문자열은 없음으로 처리).
+    업로드는 최대 batch_upload_concurrency 개씩 동시에 진행하고,
+    스토리는 업로드가 끝난 사진부터 이전 스토리를 이어받아 순서대로 생성합니다 (파이프라인).
+    모든 Image 는 마지막에 한 번의 flush 로 저장됩니다.
+    """
+    if len(files) > IMAGE_SETTINGS.batch_max_files:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {IMAGE_SETTINGS.batch_max_files}장까지 업로드할 수 있습니다.")
+
+    def _nth(values: Optional[list[str]], i: int) -> Optional[str]:
+        if values is None or i >= len(values):
+            return None
+        return values[i] or None
+
+    await release_session()
+    timer = StageTimer("create_images_batch")
+    semaphore = asyncio.Semaphore(IMAGE_SETTINGS.batch_upload_concurrency)
+
+    async def upload(i: int, file: UploadFile):
+        async with semaphore:
+            return await timer.run(f"upload{i}", image_service.upload_image_for_story(user.id, file))
+
+    context_task = asyncio.ensure_future(
+        timer.run("context", chapter_service.get_story_context(chapter_id))
+    )
+    upload_tasks = [asyncio.ensure_future(upload(i, file)) for i, file in enumerate(files)]
+    try:
+        summary, stories = await context_task
+        stories = list(stories)
+        # summary 모드에서는 배치 안에서 쌓이는 스토리도 최근 STORY_RECENT_COUNT 개만 프롬프트에 넣음
+        window = GPT_SETTINGS.STORY_RECENT_COUNT if GPT_SETTINGS.STORY_CONTEXT_MODE == "summary" else None
+        items: list[tuple[str, str]] = []
+        for i, upload_task in enumerate(upload_tasks):
+            url_resp, model_image = await upload_task
+            try:
+                story_text = await timer.run(f"generate{i}", generate_continuous_story(
+                    previous_stories=stories[-window:] if window else stories,
+                    summary=summary,
+                    file_url=model_image.url(),
+                    content_type=model_image.content_type,
+                    keywords=_nth(keywords, i),
+                    user_query=_nth(queries, i),
+                    user_id=user.id,
+                    model=story_model("batch"),
+                ))
+            except CircuitOpenError as e:
+                raise StoryGenerationUnavailableError(e.retry_after) from e
+            stories.append(story_text)
+            items.append((url_resp.file_key, story_text))
+    except BaseException:
+        for task in [context_task, *upload_tasks]:
+            task.cancel()
+        await asyncio.gather(context_task, *upload_tasks, return_exceptions=True)
+        raise
+
+    images = await timer.run("save", image_store.add_images(user.id, chapter_id, items))
+    CHAPTER_SUMMARIZER.schedule(chapter_id)
+    CHAPTER_BOOKENDS.notify(chapter_id)
+    timer.log(chapter=chapter_id, files=len(files))
+    return ImageListResponse.from_images(images)
+
+
+# 요청이 끝난 뒤에도 이어서 실행되는 태스크 (약한 참조만 남아 GC 되지 않도록 보관)
+_background_tasks: set[asyncio.Task] = set()
+
+async def _save_streamed_story(image_store: ImageStore, image: Image, chapter_id: int) -> None:
+    await image_store.save_story(image.id, image.content, image.story_status)
+    if image.content:
+        CHAPTER_SUMMARIZER.schedule(chapter_id)
+        CHAPTER_BOOKENDS.notify(chapter_id)
+
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@image_router.post("/create/{chapter_id}/stream", status_code=200)
+async def create_image_stream(
+    user: Annotated[User, Depends(get_current_user_from_header)],
+    chapter_id: int,
+    image_service: Annotated[ImageService, Depends()],
+    chapter_service: Annotated[ChapterService, Depends()],
+    image_store: Annotated[ImageStore, Depends()],
+    file: UploadFile = File(...),
+    query: Optional[str] = Form(None),
+    keyword: Optional[str] = Form(None)
+) -> StreamingResponse:
+    """
+    /create/{chapter_id} 의 스트리밍 버전. 생성되는 스토리를 Server-Sent Events 로 토큰 단위로 보냅니다.
+    - event: image  → 저장된 이미지 정보 (스토리는 비어 있음)
+    - data          → {"delta": "..."} 텍스트 조각
+    - event: done   → 스토리가 채워진 최종 이미지 정보
+    클라이언트가 중간에 끊어도 그때까지 받은 텍스트는 저장됩니다.
+    """
+    await release_session()
+    (url_resp, model_image), (summary, previous_stories) = await gather_or_cancel(
+        image_service.upload_image_for_story(user.id, file),
+        chapter_service.get_story_context(chapter_id),
     )
-    
-    image = Image(
-        file_url = file_url,
-        chapter_id = chapter_id,
-        user_id = user.id,
-        is_main = False,
-        content = story_text,
+    image = await image_store.add_image(
+        user_id=user.id,
+        chapter_id=chapter_id,
+        file_key=url_resp.file_key,
+        story_status="pending",
     )
 
-    SESSION.add(image)
-    await SESSION.commit()
+    async def event_stream():
+        chunks: list[str] = []
+        finished = False
+        try:
+            yield _sse(ImageProfileResponse.from_image(image).model_dump(), event="image")
+            # 연결이 끊겨 이 제너레이터가 닫히면 OpenAI 스트림도 GC 를 기다리지 않고 바로 닫음
+            async with contextlib.aclosing(stream_continuous_story(
+                previous_stories=previous_stories,
+                summary=summary,
+                file_url=model_image.url(),
+                content_type=model_image.content_type,
+                keywords=keyword,
+                user_query=query,
+                user_id=user.id,
+                model=story_model("stream"),
+            )) as stream:
+                async for delta in stream:
+                    chunks.append(delta)
+                    yield _sse({"delta": delta})
+            finished = True
+        except Exception:
+            logger.exception(f"스토리 스트리밍 실패: image={image.id}")
+        finally:
+            image.content = "".join(chunks).strip() or None
+            if finished:
+                image.story_status = "done"
+            else:
+                image.story_status = "partial" if image.content else "failed"
+            # 연결이 끊겨 취소되더라도 저장과 요약/bookend 예약은 끝까지 수행되도록 별도 태스크로 실행
+            task = asyncio.create_task(_save_streamed_story(image_store, image, chapter_id))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            await asyncio.shield(task)
+        if finished:
+            yield _sse(ImageProfileResponse.from_image(image).model_dump(), event="done")
+        else:
+            yield _sse({"detail": "스토리 생성에 실패했습니다."}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@image_router.post("/create/{chapter_id}/async", status_code=202)
+async def create_image_async(
+    user: Annotated[User, Depends(get_current_user_from_header)],
+    chapter_id: int,
+    image_service: Annotated[ImageService, Depends()],
+    chapter_service: Annotated[ChapterService, Depends()],
+    job_store: Annotated[JobStore, Depends()],
+    file: UploadFile = File(...),
+    query: Optional[str] = Form(None),
+    keyword: Optional[str] = Form(None)
+) -> StoryJobResponse:
+    """
+    이미지를 업로드하고 스토리 생성은 백그라운드 작업으로 넘긴 뒤 바로 202 를 반환합니다.
+    결과는 /jobs/{job_id} 로 확인합니다.
+    """
+    await release_session()
+    (url_resp, model_image), _ = await gather_or_cancel(
+        image_service.upload_image_for_story(user.id, file),
+        chapter_service.ensure_chapter_exists(chapter_id),
+    )
+
+    image, job = await job_store.create_story_job(
+        user_id=user.id,
+        chapter_id=chapter_id,
+        file_key=url_resp.file_key,
+        model_key=model_image.key,
+        model_content_type=model_image.content_type,
+        keyword=keyword,
+        query=query,
+    )
+    STORY_JOB_WORKER.notify()
+
+    return StoryJobResponse.from_job(job, image)
+
+@image_router.get("/jobs/{job_id}", status_code=200)
+async def get_story_job(
+    user: Annotated[User, Depends(get_current_user_from_header)],
+    job_id: int,
+    image_store: Annotated[ImageStore, Depends()],
+    job_store: Annotated[JobStore, Depends()],
+    wait: int = Query(0, ge=0),
+) -> StoryJobResponse:
+    """
+    스토리 생성 작업 상태를 조회합니다.
+    wait(초)를 주면 작업이 끝날 때까지 최대 그 시간만큼 기다렸다가 응답합니다 (long-poll).
+    """
+    job = await job_store.get_job(job_id)
+    image = await image_store.get_image(job.image_id) if job is not None else None
+    if job is None or image is None or image.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if wait > 0:
+        job = await STORY_JOB_WORKER.wait_for(job_id, min(wait, JOB_SETTINGS.long_poll_max))
+        # 기다리는 동안 이미지가 삭제되면 작업도 함께 삭제됨
+        image = await image_store.get_image(job.image_id) if job is not None else None
+        if job is None or image is None:
+            raise HTTPException(status_code=404, detail="Job not found")
 
-    return ImageProfileResponse.from_image(image)
\ No newline at end of file
+    return StoryJobResponse.from_job(job, image)
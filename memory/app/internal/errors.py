@@ -0,0 +1,9 @@
+from memory.common.errors import MysolHTTPException
+
+class InternalApiDisabledError(MysolHTTPException):
+    def __init__(self, message: str = "Not Found") -> None:
+        super().__init__(status_code=404, detail=message)
+
+class InvalidInternalTokenError(MysolHTTPException):
+    def __init__(self, message: str = "내부 API 토큰이 올바르지 않습니다.") -> None:
+        super().__init__(status_code=403, detail=message)
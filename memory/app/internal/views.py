@@ -0,0 +1,44 @@
+import hmac
+from fastapi import APIRouter, Depends, Header
+from typing import Annotated
+
+from memory.app.internal.errors import InternalApiDisabledError, InvalidInternalTokenError
+from memory.common.metrics import METRICS
+from memory.database.connection import DB
+from memory.database.settings import PW_SETTINGS
+
+async def verify_internal_token(
+    x_internal_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """
+    운영용 조회 API 는 일반 사용자 로그인이 아니라 별도 토큰(X-Internal-Token)으로만 접근합니다.
+    토큰이 설정돼 있지 않으면 엔드포인트가 없는 것처럼 404 를 반환합니다.
+    """
+    if not PW_SETTINGS.internal_api_token:
+        raise InternalApiDisabledError()
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode(), PW_SETTINGS.internal_api_token.encode()
+    ):
+        raise InvalidInternalTokenError()
+
+internal_router = APIRouter(dependencies=[Depends(verify_internal_token)])
+
+@internal_router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> dict:
+    """
+    프로세스 내 메트릭(OpenAI 호출 지연 시간/토큰 사용량 등)을 조회합니다.
+    """
+    return METRICS.snapshot()
+
+@internal_router.get("/db-pool", include_in_schema=False)
+async def get_db_pool() -> dict:
+    """
+    이 워커의 DB 커넥션 풀 상태와 대기 시간/타임아웃 메트릭을 조회합니다.
+    """
+    snapshot = METRICS.snapshot()
+    return {
+        "pool": DB.engine.pool.stats(),
+        "replica_pool": DB.replica_engine.pool.stats() if DB.replica_engine is not None else None,
+        "wait_ms": snapshot["histograms"].get("db.pool.wait_ms"),
+        "timeouts": snapshot["counters"].get("db.pool.timeouts", 0),
+    }
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+
+from memory.app.image.models import Image
+from memory.app.image.dto.responses import ImageProfileResponse
+from memory.app.job.models import StoryJob
+
+class StoryJobResponse(BaseModel):
+    job_id: int
+    status: str
+    image: Optional[ImageProfileResponse] = None
+
+    @staticmethod
+    def from_job(job: StoryJob, image: Optional[Image]) -> "StoryJobResponse":
+        return StoryJobResponse(
+            job_id=job.id,
+            status=job.status,
+            image=ImageProfileResponse.from_image(image) if image is not None else None,
+        )
@@ -0,0 +1,41 @@
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import String, DateTime, func, Integer, Text, ForeignKey, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from memory.database.common import Base, intpk
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    DRAFT = "draft"  # Image 전용: 초안이 저장되어 있고 재생성 작업이 대기 중
+
+class StoryJob(Base):
+    """
+    비동기 스토리 생성 작업.
+    DB 에 저장되므로 서버가 재시작되어도 대기 중인 작업이 사라지지 않습니다.
+    """
+    __tablename__ = "story_job"
+
+    id: Mapped[intpk]
+    image_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("image.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status: Mapped[str] = mapped_column(String(20), default=JobStatus.PENDING.value, index=True)
+
+    model_key: Mapped[str] = mapped_column(Text, nullable=False)
+    model_content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    keyword: Mapped[str | None] = mapped_column(Text, nullable=True)
+    model: Mapped[str | None] = mapped_column(String(100), nullable=True)  # 비어 있으면 job 엔드포인트 모델
+    query: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    not_before: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # 재시도 백오프: 이 시각 전에는 가져가지 않음
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
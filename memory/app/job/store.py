@@ -0,0 +1,168 @@
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_, select, update
+
+from memory.app.image.models import Image
+from memory.app.job.models import StoryJob, JobStatus
+from memory.database.annotation import transactional, retry_on_disconnect
+from memory.database.connection import SESSION
+
+CLAIM_CANDIDATES = 5
+
+class JobStore:
+    @transactional
+    async def create_story_job(
+        self,
+        user_id: int,
+        chapter_id: int,
+        file_key: str,
+        model_key: str,
+        model_content_type: str | None,
+        keyword: str | None,
+        query: str | None,
+        draft: str | None = None,
+        model: str | None = None,
+    ) -> tuple[Image, StoryJob]:
+        """
+        Image 와 그 스토리를 생성할 작업을 한 트랜잭션으로 저장합니다.
+        draft 가 있으면 초안을 content 로 저장하고(draft), 작업이 model 로 다시 생성해 교체합니다.
+        없으면 스토리가 비어 있는(pending) Image 를 만듭니다.
+        """
+        image = Image(
+            file_key=file_key,
+            chapter_id=chapter_id,
+            user_id=user_id,
+            is_main=False,
+            content=draft,
+            story_status=JobStatus.DRAFT.value if draft is not None else JobStatus.PENDING.value,
+        )
+        SESSION.add(image)
+        await SESSION.flush()
+
+        job = StoryJob(
+            image_id=image.id,
+            status=JobStatus.PENDING.value,
+            model_key=model_key,
+            model_content_type=model_content_type,
+            keyword=keyword,
+            query=query,
+            model=model,
+            attempts=0,
+        )
+        SESSION.add(job)
+        await SESSION.flush()
+        return image, job
+
+    @retry_on_disconnect
+    @transactional
+    async def get_job(self, job_id: int) -> Optional[StoryJob]:
+        return await SESSION.get(StoryJob, job_id)
+
+    @transactional
+    async def claim_next_job(self) -> Optional[StoryJob]:
+        """
+        가장 오래된 pending 작업 하나를 running 으로 바꾸고 반환합니다.
+        조건부 UPDATE 로 선점하므로 여러 워커/프로세스가 같은 작업을 가져가지 않습니다.
+        재시도 대기 중(not_before 이전)인 작업은 건너뜁니다.
+        """
+        job_ids = (
+            await SESSION.scalars(
+                select(StoryJob.id)
+                .where(
+                    StoryJob.status == JobStatus.PENDING.value,
+                    or_(StoryJob.not_before.is_(None), StoryJob.not_before <= datetime.now(timezone.utc)),
+                )
+                .order_by(StoryJob.id)
+                .limit(CLAIM_CANDIDATES)
+            )
+        ).all()
+        for job_id in job_ids:
+            result = await SESSION.execute(
+                update(StoryJob)
+                .where(StoryJob.id == job_id, StoryJob.status == JobStatus.PENDING.value)
+                .values(
+                    status=JobStatus.RUNNING.value,
+                    locked_at=datetime.now(timezone.utc),
+                    attempts=StoryJob.attempts + 1,
+                )
+            )
+            if result.rowcount == 1:
+                return await SESSION.get(StoryJob, job_id)
+        return None
+
+    @transactional
+    async def complete_job(self, job_id: int, image_id: int, content: str) -> None:
+        await SESSION.execute(
+            update(Image)
+            .where(Image.id == image_id)
+            .values(
+                content=content,
+                story_status=JobStatus.DONE.value,
+                story_version=Image.story_version + 1,
+            )
+        )
+        await SESSION.execute(
+            update(StoryJob)
+            .where(StoryJob.id == job_id)
+            .values(status=JobStatus.DONE.value, error=None, locked_at=None)
+        )
+
+    @transactional
+    async def fail_job(
+        self, job_id: int, image_id: int, error: str, retry: bool, retry_delay: float = 0,
+    ) -> None:
+        """
+        retry 면 다시 대기열에 넣고(retry_delay 초 뒤부터 가져갈 수 있음), 아니면 작업과 이미지를 failed 로 표시합니다.
+        """
+        status = JobStatus.PENDING if retry else JobStatus.FAILED
+        not_before = datetime.now(timezone.utc) + timedelta(seconds=retry_delay) if retry and retry_delay > 0 else None
+        await SESSION.execute(
+            update(StoryJob)
+            .where(StoryJob.id == job_id)
+            .values(status=status.value, error=error, locked_at=None, not_before=not_before)
+        )
+        if not retry:
+            await SESSION.execute(
+                update(Image)
+                .where(Image.id == image_id, Image.story_status == JobStatus.PENDING.value)
+                .values(story_status=JobStatus.FAILED.value)
+            )
+            # 재생성에 실패한 초안은 그대로 최종본으로 둠
+            await SESSION.execute(
+                update(Image)
+                .where(Image.id == image_id, Image.story_status == JobStatus.DRAFT.value)
+                .values(story_status=JobStatus.DONE.value)
+            )
+
+    @transactional
+    async def release_job(self, job_id: int) -> None:
+        """처리하지 못한 작업을 시도 횟수를 되돌린 채 다시 대기열에 넣습니다 (OpenAI 차단 중 등)."""
+        await SESSION.execute(
+            update(StoryJob)
+            .where(StoryJob.id == job_id)
+            .values(
+                status=JobStatus.PENDING.value,
+                locked_at=None,
+                attempts=StoryJob.attempts - 1,
+            )
+        )
+
+    @transactional
+    async def requeue_stale_jobs(self, stale_after: int, max_attempts: int) -> list[int]:
+        """
+        워커가 죽어서 running 상태로 남은 작업을 다시 pending 으로 돌립니다.
+        재시도 횟수를 다 쓴 작업은 failed 로 처리합니다.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+        stale_jobs = (
+            await SESSION.scalars(
+                select(StoryJob).where(
+                    StoryJob.status == JobStatus.RUNNING.value,
+                    StoryJob.locked_at < cutoff,
+                )
+            )
+        ).all()
+        for job in stale_jobs:
+            retry = job.attempts < max_attempts
+            await self.fail_job(job.id, job.image_id, "작업이 시간 내에 끝나지 않았습니다.", retry)
+        return [job.id for job in stale_jobs]
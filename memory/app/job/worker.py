@@ -0,0 +1,169 @@
+import asyncio
+import random
+from loguru import logger
+
+from memory.app.chapter.store import ChapterStore
+from memory.app.chapter.summary import CHAPTER_SUMMARIZER
+from memory.app.chapter.bookend import CHAPTER_BOOKENDS
+from memory.app.image.store import ImageStore
+from memory.app.job.models import StoryJob, JobStatus
+from memory.app.job.store import JobStore
+from memory.common.openai_service import generate_continuous_story, story_model, CircuitOpenError
+from memory.common.s3_client import PRESIGNED_URLS
+from memory.database.settings import JOB_SETTINGS, GPT_SETTINGS
+
+
+class StoryJobWorker:
+    """
+    DB 의 story_job 테이블을 대기열로 쓰는 프로세스 내 asyncio 워커 풀.
+    새 작업이 들어오면 notify() 로 바로 깨우고, 다른 프로세스에서 들어온 작업은 주기적으로 확인합니다.
+    """
+
+    def __init__(self):
+        self.job_store = JobStore()
+        self.image_store = ImageStore()
+        self.chapter_store = ChapterStore()
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._finished: dict[int, asyncio.Event] = {}
+        self._waiters: dict[int, int] = {}  # job_id 별로 wait_for 중인 요청 수
+
+    async def start(self) -> None:
+        requeued = await self.job_store.requeue_stale_jobs(
+            JOB_SETTINGS.stale_after, JOB_SETTINGS.max_attempts
+        )
+        if requeued:
+            logger.info(f"멈춰 있던 스토리 작업 재처리: {requeued}")
+
+        for i in range(JOB_SETTINGS.concurrency):
+            self._tasks.append(asyncio.create_task(self._run(), name=f"story-job-worker-{i}"))
+        self._tasks.append(asyncio.create_task(self._reap_stale_jobs(), name="story-job-reaper"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def wait_for(self, job_id: int, timeout: float) -> StoryJob | None:
+        """
+        작업이 끝나거나 timeout 이 지날 때까지 기다린 뒤 작업을 반환합니다 (long-poll 용).
+        같은 프로세스에서 처리되면 바로 깨어나고, 그 외에는 poll_interval 마다 DB 를 확인합니다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            while True:
+                # 작업이 재시도로 대기열에 돌아가면 이전 이벤트는 이미 set 되어 있으므로 매번 현재 이벤트를 가져옴
+                event = self._finished.setdefault(job_id, asyncio.Event())
+                job = await self.job_store.get_job(job_id)
+                if job is None or job.status in (JobStatus.DONE.value, JobStatus.FAILED.value):
+                    return job
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return job
+                try:
+                    await asyncio.wait_for(event.wait(), min(remaining, JOB_SETTINGS.poll_interval))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # 같은 작업을 기다리는 다른 요청이 남아 있으면 이벤트를 지우지 않음
+            self._waiters[job_id] -= 1
+            if self._waiters[job_id] == 0:
+                del self._waiters[job_id]
+                self._finished.pop(job_id, None)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await self.job_store.claim_next_job()
+            except Exception:
+                logger.exception("스토리 작업 조회 실패")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), JOB_SETTINGS.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self._process(job)
+
+    async def _process(self, job: StoryJob) -> None:
+        try:
+            image = await self.image_store.get_image(job.image_id)
+            if image is None:
+                # 작업 도중 이미지가 삭제됨: 다시 시도해도 소용없으므로 바로 failed
+                await self.job_store.fail_job(job.id, job.image_id, "이미지가 삭제되었습니다.", retry=False)
+                return
+            context = await self.chapter_store.get_story_context(
+                image.chapter_id,
+                before_image_id=image.id,
+                use_summary=GPT_SETTINGS.STORY_CONTEXT_MODE == "summary",
+            )
+            if context is None:
+                # 작업 도중 챕터가 삭제됨
+                await self.job_store.fail_job(job.id, job.image_id, "챕터가 삭제되었습니다.", retry=False)
+                return
+            summary, previous_stories = context
+            story_text = await generate_continuous_story(
+                previous_stories=previous_stories,
+                summary=summary,
+                file_url=PRESIGNED_URLS.get_url(job.model_key),
+                content_type=job.model_content_type,
+                keywords=job.keyword,
+                user_query=job.query,
+                user_id=image.user_id,
+                model=job.model or story_model("job"),
+            )
+            await self.job_store.complete_job(job.id, job.image_id, story_text)
+            CHAPTER_SUMMARIZER.schedule(image.chapter_id)
+            CHAPTER_BOOKENDS.notify(image.chapter_id)
+        except asyncio.CancelledError:
+            # 종료 중: 다음 실행 때 다시 처리되도록 대기열로 되돌림
+            await self.job_store.fail_job(job.id, job.image_id, "서버 종료로 중단되었습니다.", retry=True)
+            raise
+        except CircuitOpenError as e:
+            # OpenAI 차단 중: 시도 횟수를 쓰지 않고 되돌린 뒤 차단이 풀릴 때까지 이 워커는 쉼
+            logger.warning(f"OpenAI 차단 중이라 스토리 작업을 미룸: job={job.id} ({e.retry_after:.1f}s)")
+            await self.job_store.release_job(job.id)
+            await asyncio.sleep(e.retry_after)
+        except Exception as e:
+            retry = job.attempts < JOB_SETTINGS.max_attempts
+            logger.exception(f"스토리 작업 실패: job={job.id} attempts={job.attempts} retry={retry}")
+            # 바로 다시 가져가면 같은 원인으로 연달아 실패하므로 not_before 로 백오프
+            await self.job_store.fail_job(
+                job.id, job.image_id, str(e), retry=retry, retry_delay=_retry_delay(job.attempts),
+            )
+        finally:
+            event = self._finished.pop(job.id, None)
+            if event is not None:
+                event.set()
+
+    async def _reap_stale_jobs(self) -> None:
+        while True:
+            await asyncio.sleep(max(JOB_SETTINGS.stale_after / 2, JOB_SETTINGS.poll_interval))
+            try:
+                requeued = await self.job_store.requeue_stale_jobs(
+                    JOB_SETTINGS.stale_after, JOB_SETTINGS.max_attempts
+                )
+                if requeued:
+                    logger.warning(f"멈춰 있던 스토리 작업 재처리: {requeued}")
+                    self.notify()
+            except Exception:
+                logger.exception("멈춘 스토리 작업 확인 실패")
+
+
+def _retry_delay(attempts: int) -> float:
+    """지수 백오프에 jitter 를 준 재시도 대기 시간(초). 같은 시점에 실패한 작업들이 동시에 다시 실행되지 않게 분산"""
+    delay = min(JOB_SETTINGS.retry_max_delay, JOB_SETTINGS.retry_base_delay * 2 ** max(attempts - 1, 0))
+    return random.uniform(delay / 2, delay)
+
+
+STORY_JOB_WORKER = StoryJobWorker()
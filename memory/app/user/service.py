@@ -39,10 +39,11 @@ class UserService:
         return user
 
     async def get_user_by_login_id(self, login_id: str) -> User:
-        return await self.user_store.get_user_by_field("login_id", login_id)
+        return await self.user_store.get_user_by_field_read_only("login_id", login_id)
 
     async def signin(self, login_id: str, password: str) -> tuple[str, str]:
-        user = await self.get_user_by_login_id(login_id=login_id)
+        # 가입 직후 로그인도 레플리카 지연 없이 보이도록 primary 에서 조회
+        user = await self.user_store.get_user_by_field("login_id", login_id)
 
         if not user:
             raise UserNotFoundError()
@@ -3,7 +3,7 @@ from sqlalchemy import select
 from datetime import datetime
 
 from memory.app.user.models import User, BlockedToken
-from memory.database.annotation import transactional
+from memory.database.annotation import transactional, retry_on_disconnect
 from memory.database.connection import SESSION
 from memory.app.user.hashing import Hasher
 from memory.app.user.errors import UserNameAlreadyExistsError
@@ -21,9 +21,18 @@ class UserStore:
         await SESSION.flush()
         return user
 
+    # 가입 중복 검사 / 로그인은 방금 쓴 행을 봐야 하므로 항상 primary 에서 읽음
+    @retry_on_disconnect
+    @transactional
     async def get_user_by_field(self, field: str, value) -> Optional[User]:
         return await SESSION.scalar(select(User).where(getattr(User, field) == value))
 
+    # 인증 / 프로필 조회용: 레플리카가 있으면 레플리카에서 읽음
+    @retry_on_disconnect
+    @transactional(read_only=True)
+    async def get_user_by_field_read_only(self, field: str, value) -> Optional[User]:
+        return await SESSION.scalar(select(User).where(getattr(User, field) == value))
+
     # @transactional
     # async def update_user(
     #     self, user_id: int, username: Optional[str], email: Optional[str], new_password: Optional[str]
@@ -50,6 +59,8 @@ class UserStore:
         blocked_token = BlockedToken(token_id=token_id, expired_at=expired_at)
         SESSION.add(blocked_token)
 
+    @retry_on_disconnect
+    @transactional
     async def is_token_blocked(self, token_id: str) -> bool:
         return (
             await SESSION.scalar(
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from typing import Any, Awaitable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """
+    asyncio.gather 와 같지만, 하나라도 실패하면 나머지 작업을 취소하고 정리가 끝난 뒤 예외를 다시 던집니다.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class StageTimer:
+    """
+    요청 안의 단계별 시작 시점과 소요 시간을 기록해 한 줄로 로깅합니다.
+    여러 단계가 동시에 실행될 때 어느 단계가 critical path 인지 확인하는 용도입니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, tuple[float, float]] = {}
+
+    async def run(self, stage: str, aw: Awaitable[T]) -> T:
+        start = time.perf_counter()
+        try:
+            return await aw
+        finally:
+            self.stages[stage] = (start - self.started_at, time.perf_counter() - start)
+
+    def log(self, **extra: Any) -> None:
+        total = (time.perf_counter() - self.started_at) * 1000
+        stages = " ".join(
+            f"{stage}=+{offset * 1000:.0f}/{duration * 1000:.0f}ms"
+            for stage, (offset, duration) in self.stages.items()
+        )
+        extras = " ".join(f"{key}={value}" for key, value in extra.items())
+        logger.info(f"{self.name} total={total:.0f}ms {stages} {extras}".rstrip())
@@ -0,0 +1,80 @@
+import time
+from collections import defaultdict, deque
+from typing import Any
+
+
+class _Histogram:
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def snapshot(self) -> dict[str, float]:
+        ordered = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": round(percentile(0.5), 3),
+            "p95": round(percentile(0.95), 3),
+            "p99": round(percentile(0.99), 3),
+            "max": round(self.max, 3),
+        }
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 메트릭 저장소. 외부 수집기 없이 카운터/게이지/분포를 모아 두고 snapshot() 으로 조회합니다.
+    분포의 count/sum/max 는 누적값이고, 백분위수는 최근 window 개 샘플로 계산합니다.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self.started_at = time.time()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+        self._histograms: dict[str, _Histogram] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = _Histogram(self.window)
+        histogram.observe(value)
+
+    def percentile(self, name: str, p: float, min_samples: int = 1) -> float | None:
+        """최근 샘플의 백분위수. 샘플이 min_samples 개보다 적으면 None 을 반환합니다."""
+        histogram = self._histograms.get(name)
+        if histogram is None or len(histogram.samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(histogram.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "counters": dict(sorted(self._counters.items())),
+            "gauges": dict(sorted(self._gauges.items())),
+            "histograms": {name: h.snapshot() for name, h in sorted(self._histograms.items())},
+        }
+
+
+METRICS = MetricsRegistry()
@@ -1,23 +1,357 @@
-from openai import AsyncOpenAI
-from memory.database.settings import GPTSettings
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Hashable, TypeVar
+from loguru import logger
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError
+from memory.database.settings import GPT_SETTINGS
+from memory.common.metrics import METRICS
+from memory.common.tokens import estimate_message_tokens
 
-# 환경변수나 .env.gpt에서 키를 읽어 옵니다
-GPT_SETTINGS = GPTSettings()
-client = AsyncOpenAI(api_key=GPT_SETTINGS.OPENAI_API_KEY)
+T = TypeVar("T")
 
-async def generate_continuous_story(
+# 환경변수나 .env.gpt에서 키를 읽어 옵니다 (GPT_SETTINGS)
+# 재시도는 OpenAIScheduler 가 rate limit 과 함께 관리하므로 SDK 자체 재시도는 끕니다
+client = AsyncOpenAI(
+    api_key=GPT_SETTINGS.OPENAI_API_KEY,
+    base_url=GPT_SETTINGS.OPENAI_BASE_URL,
+    max_retries=0,
+    timeout=GPT_SETTINGS.OPENAI_TIMEOUT,
+)
+
+
+class TokenBucket:
+    """분당 limit 만큼 채워지는 토큰 버킷. limit 이 0 이하면 제한하지 않습니다."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.level = float(per_minute)
+        self.rate = per_minute / 60
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float) -> None:
+        if self.capacity <= 0:
+            return
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.level >= amount:
+                self.level -= amount
+                return
+            await asyncio.sleep((amount - self.level) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """추정치로 미리 뺀 양을 실제 사용량에 맞춰 보정합니다 (양수면 더 뺌)."""
+        if self.capacity <= 0:
+            return
+        self._refill()
+        self.level = max(-self.capacity, self.level - amount)
+
+
+def _retry_after(error: Exception) -> float | None:
+    """응답의 retry-after-ms / retry-after 헤더를 초 단위로 반환합니다."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            value = headers["retry-after"]
+            try:
+                return float(value)
+            except ValueError:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+def _is_outage(error: Exception) -> bool:
+    """회로 차단기가 실패로 세는 오류. 429 나 4xx 는 OpenAI 가 응답은 하고 있으므로 제외합니다."""
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 있어 OpenAI 를 호출하지 않고 거절됨. retry_after 초 뒤에 다시 시도할 수 있습니다."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"OpenAI 호출 차단 중 ({retry_after:.1f}s 후 재시도 가능)")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    OpenAI 가 느려지거나 오류를 내기 시작하면 요청이 타임아웃까지 매달리지 않도록 바로 실패시킵니다.
+    - closed: 최근 BREAKER_WINDOW 초의 호출 결과로 실패율/느린 호출 비율을 보고 기준을 넘으면 open
+    - open: BREAKER_COOLDOWN 초 동안 모든 호출을 CircuitOpenError 로 거절
+    - half_open: 시험 호출 BREAKER_HALF_OPEN_CALLS 개만 보내 모두 성공하면 closed, 하나라도 실패하면 다시 open
+    """
+
+    STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+    def __init__(self):
+        self.state = "closed"
+        self._calls: deque[tuple[float, bool, bool]] = deque()  # (시각, 실패, 느린 호출)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        METRICS.set_gauge("openai.breaker.state", self.STATES[self.state])
+
+    def check(self) -> None:
+        """열려 있으면 CircuitOpenError 를 던집니다 (대기열에 들어가기 전 확인용, 시험 호출 몫은 잡지 않음)."""
+        if not GPT_SETTINGS.BREAKER_ENABLED:
+            return
+        if self.state == "open":
+            remaining = self._opened_at + GPT_SETTINGS.BREAKER_COOLDOWN - time.monotonic()
+            if remaining > 0:
+                METRICS.incr("openai.breaker.rejected")
+                raise CircuitOpenError(remaining)
+
+    def allow(self) -> bool:
+        """
+        호출 직전에 부릅니다. 거절되면 CircuitOpenError 를 던지고,
+        half_open 의 시험 호출이면 True 를 반환합니다 (결과는 record/cancel 에 그대로 넘김).
+        """
+        if not GPT_SETTINGS.BREAKER_ENABLED:
+            return False
+        self.check()
+        if self.state == "open":
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self._probes + self._probe_successes >= GPT_SETTINGS.BREAKER_HALF_OPEN_CALLS:
+                # 시험 호출 결과가 나오기 전: 복구 중인 upstream 에 바로 다시 몰리지 않도록 차단 시간만큼 미루게 함
+                METRICS.incr("openai.breaker.rejected")
+                raise CircuitOpenError(GPT_SETTINGS.BREAKER_COOLDOWN)
+            self._probes += 1
+            return True
+        return False
+
+    def record(self, probe: bool, failed: bool, latency_ms: float) -> None:
+        if not GPT_SETTINGS.BREAKER_ENABLED:
+            return
+        slow = latency_ms >= GPT_SETTINGS.BREAKER_SLOW_CALL_MS
+        if probe:
+            if self.state != "half_open":
+                return
+            self._probes -= 1
+            if failed or slow:
+                self._transition("open")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= GPT_SETTINGS.BREAKER_HALF_OPEN_CALLS:
+                self._transition("closed")
+            return
+        if self.state != "closed":
+            # 차단되기 전에 시작된 호출의 결과는 무시
+            return
+
+        now = time.monotonic()
+        self._calls.append((now, failed, slow))
+        while self._calls and self._calls[0][0] < now - GPT_SETTINGS.BREAKER_WINDOW:
+            self._calls.popleft()
+        total = len(self._calls)
+        if total < GPT_SETTINGS.BREAKER_MIN_CALLS:
+            return
+        failures = sum(1 for _, f, _ in self._calls if f)
+        slows = sum(1 for _, _, s in self._calls if s)
+        if failures / total >= GPT_SETTINGS.BREAKER_ERROR_RATE or slows / total >= GPT_SETTINGS.BREAKER_SLOW_RATE:
+            logger.warning(f"OpenAI 회로 차단: calls={total} failures={failures} slow={slows}")
+            self._transition("open")
+
+    def cancel(self, probe: bool) -> None:
+        """결과 없이 취소된 호출 (hedge 에서 진 쪽 등). 시험 호출이면 몫만 돌려줍니다."""
+        if probe and self.state == "half_open":
+            self._probes -= 1
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"OpenAI 회로 차단기: {self.state} -> {state}")
+        self.state = state
+        self._probes = 0
+        self._probe_successes = 0
+        if state == "open":
+            self._opened_at = time.monotonic()
+        if state == "closed":
+            self._calls.clear()
+        METRICS.incr(f"openai.breaker.transitions.{state}")
+        METRICS.set_gauge("openai.breaker.state", self.STATES[state])
+
+
+BREAKER = CircuitBreaker()
+
+
+class OpenAIScheduler:
+    """
+    OpenAI 호출을 한곳에서 조율합니다.
+    - 전역 동시 호출 수 제한 (MAX_CONCURRENCY)
+    - 분당 요청 수/토큰 수 토큰 버킷 (RPM_LIMIT / TPM_LIMIT)
+    - 사용자별 대기열을 라운드로빈으로 꺼내 한 사용자의 대량 업로드가 다른 사용자를 굶기지 않게 함
+    - 429/5xx/연결 오류는 retry-after 를 따르거나 jitter 를 준 지수 백오프로 재시도
+    429 를 받으면 retry-after 동안 모든 호출을 멈춰 한꺼번에 다시 몰리지 않게 합니다.
+    속도 제한 대기는 슬롯을 잡기 전에 하므로, 슬롯은 실제로 호출 중인 요청만 차지합니다.
+    """
+
+    def __init__(self):
+        self._active = 0
+        self._queues: OrderedDict[Hashable, deque[asyncio.Future]] = OrderedDict()
+        self._waiting = 0
+        self._requests = TokenBucket(GPT_SETTINGS.RPM_LIMIT)
+        self._tokens = TokenBucket(GPT_SETTINGS.TPM_LIMIT)
+        self._paused_until = 0.0
+
+    async def execute(self, user_id: Hashable, estimated_tokens: int, request: Callable[[], Awaitable[T]]) -> T:
+        """request 를 실행하고 결과를 반환합니다. 슬롯은 호출이 끝나면 바로 반환합니다."""
+        result = await self.open(user_id, estimated_tokens, request)
+        self.release()
+        return result
+
+    async def open(self, user_id: Hashable, estimated_tokens: int, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        슬롯을 잡고 request 를 실행합니다 (필요하면 재시도). 성공하면 슬롯을 잡은 채로 결과를 반환하므로,
+        스트림처럼 응답을 끝까지 읽어야 하는 호출은 다 읽은 뒤 release() 를 호출해야 합니다.
+        """
+        attempt = 0
+        while True:
+            BREAKER.check()
+            queued_at = time.perf_counter()
+            # RPM/TPM 와 429 pause 는 슬롯을 잡기 전에 기다림: 제한에 걸린 호출이 슬롯을 붙잡아
+            # 다른 사용자의 대기열까지 멈추지 않게 함
+            await self._wait_for_rate_limit(estimated_tokens)
+            await self._acquire(user_id)
+            try:
+                METRICS.observe("openai.scheduler.wait_ms", (time.perf_counter() - queued_at) * 1000)
+                return await self._call(request)
+            except Exception as e:
+                self.release()
+                attempt += 1
+                if not _is_retryable(e) or attempt > GPT_SETTINGS.MAX_RETRIES:
+                    raise
+                delay = self._backoff(e, attempt)
+                logger.warning(f"OpenAI 호출 재시도 {attempt}/{GPT_SETTINGS.MAX_RETRIES} ({delay:.1f}s 후): {e!r}")
+                METRICS.incr("openai.scheduler.retries")
+            except BaseException:
+                self.release()
+                raise
+            await asyncio.sleep(delay)
+
+    @property
+    def saturated(self) -> bool:
+        """슬롯을 기다리는 호출이 있음. 이럴 때 hedge 를 보내면 부하만 늘리므로 보내지 않습니다."""
+        return self._waiting > 0
+
+    def release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+        self._update_gauges()
+
+    def record_usage(self, estimated_tokens: int, usage) -> None:
+        if usage is not None:
+            self._tokens.adjust(usage.total_tokens - estimated_tokens)
+
+    async def _call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """회로 차단기를 거쳐 request 를 한 번 호출하고 결과와 응답 시간을 차단기에 기록합니다."""
+        probe = BREAKER.allow()
+        started_at = time.perf_counter()
+        try:
+            result = await request()
+        except Exception as e:
+            BREAKER.record(probe, _is_outage(e), (time.perf_counter() - started_at) * 1000)
+            raise
+        except BaseException:
+            BREAKER.cancel(probe)
+            raise
+        BREAKER.record(probe, False, (time.perf_counter() - started_at) * 1000)
+        return result
+
+    def _backoff(self, error: Exception, attempt: int) -> float:
+        retry_after = _retry_after(error)
+        if isinstance(error, APIStatusError) and error.status_code == 429:
+            METRICS.incr("openai.scheduler.rate_limited")
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        # full jitter: 같은 시점에 실패한 호출들이 동시에 재시도하지 않도록 분산
+        delay = random.uniform(0, min(GPT_SETTINGS.RETRY_MAX_DELAY, GPT_SETTINGS.RETRY_BASE_DELAY * 2 ** attempt))
+        if retry_after is not None:
+            delay += retry_after
+        return delay
+
+    async def _wait_for_rate_limit(self, estimated_tokens: int) -> None:
+        paused = self._paused_until - time.monotonic()
+        if paused > 0:
+            await asyncio.sleep(paused)
+        await self._requests.acquire(1)
+        await self._tokens.acquire(estimated_tokens)
+
+    async def _acquire(self, user_id: Hashable) -> None:
+        if self._active < GPT_SETTINGS.MAX_CONCURRENCY and not self._waiting:
+            self._active += 1
+            self._update_gauges()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(user_id, deque()).append(future)
+        self._waiting += 1
+        self._update_gauges()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # 아직 대기열에 있음: _dispatch 에서 건너뜀
+                self._waiting -= 1
+                self._update_gauges()
+            else:
+                # 슬롯을 받은 직후 취소됨
+                self.release()
+            raise
+
+    def _dispatch(self) -> None:
+        while self._active < GPT_SETTINGS.MAX_CONCURRENCY and self._queues:
+            # 맨 앞 사용자의 요청 하나를 꺼내고 그 사용자를 맨 뒤로 보냄 (라운드로빈)
+            user_id, queue = self._queues.popitem(last=False)
+            future = queue.popleft()
+            if queue:
+                self._queues[user_id] = queue
+            if future.cancelled():
+                continue
+            self._waiting -= 1
+            self._active += 1
+            future.set_result(None)
+
+    def _update_gauges(self) -> None:
+        METRICS.set_gauge("openai.scheduler.active", self._active)
+        METRICS.set_gauge("openai.scheduler.queue_depth", self._waiting)
+        METRICS.set_gauge("openai.scheduler.queued_users", len(self._queues))
+
+
+SCHEDULER = OpenAIScheduler()
+
+def _build_messages(
     previous_stories: list[str],
-    file_url: str,              # S3에 업로드된 공개 혹은 presigned URL
-    content_type: str,          # 이미지의 MIME 타입 (예: "image/png")
+    file_url: str,
     keywords: str | None = None,
     user_query: str | None = None,
-) -> str:
-    """
-    - previous_stories: 이전에 생성된 스토리들
-    - file_url: S3에 올린 이미지의 URL
-    - content_type: file.content_type
-    - keywords, user_query: optional 추가 컨텍스트
-    """
+    summary: str | None = None,
+) -> list[dict]:
     system_prompt = (
         "당신은 사용자가 업로드한 사진으로 회고록을 생성하는 어시스턴트입니다. "
         "각 사진마다 이전 스토리와 자연스럽게 이어서 작성해 주세요."
@@ -26,6 +360,12 @@ async def generate_continuous_story(
         {"role": "system", "content": system_prompt}
     ]
 
+    if summary:
+        messages.append({
+            "role": "user",
+            "content": f"지금까지의 이야기 요약:\n\n{summary}"
+        })
+
     if previous_stories:
         joined = "\n---\n".join(previous_stories)
         messages.append({
@@ -63,11 +403,312 @@ async def generate_continuous_story(
         ]
     })
 
-    # GPT-4o 호출
-    resp = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages
+    return messages
+
+def _build_messages_within_budget(
+    previous_stories: list[str],
+    file_url: str,
+    keywords: str | None = None,
+    user_query: str | None = None,
+    summary: str | None = None,
+) -> tuple[list[dict], int]:
+    """
+    추정 토큰 수가 PROMPT_TOKEN_BUDGET 을 넘으면 오래된 스토리 → 챕터 요약 → 키워드 순으로 덜어냅니다.
+    이미지와 사용자 쿼리는 항상 유지합니다. (messages, 추정 토큰 수) 를 반환합니다.
+    """
+    budget = GPT_SETTINGS.PROMPT_TOKEN_BUDGET
+    dropped_stories = 0
+    while True:
+        messages = _build_messages(previous_stories, file_url, keywords, user_query, summary)
+        estimated = estimate_message_tokens(messages, GPT_SETTINGS.IMAGE_TOKEN_ESTIMATE)
+        if estimated <= budget:
+            break
+        if previous_stories:
+            previous_stories = previous_stories[1:]
+            dropped_stories += 1
+        elif summary:
+            summary = None
+            METRICS.incr("openai.prompt.dropped_summary")
+        elif keywords:
+            keywords = None
+            METRICS.incr("openai.prompt.dropped_keywords")
+        else:
+            logger.warning(f"프롬프트가 토큰 예산을 넘습니다: estimated={estimated} budget={budget}")
+            METRICS.incr("openai.prompt.over_budget")
+            break
+
+    if dropped_stories:
+        METRICS.incr("openai.prompt.dropped_stories", dropped_stories)
+    METRICS.observe("openai.prompt.estimated_tokens", estimated)
+    return messages, estimated
+
+def story_model(endpoint: str, draft: bool = False) -> str:
+    """엔드포인트별 스토리 생성 모델. draft 면 티어드 모드의 초안 모델을 반환합니다."""
+    if draft:
+        return GPT_SETTINGS.STORY_DRAFT_MODEL
+    return GPT_SETTINGS.STORY_ENDPOINT_MODELS.get(endpoint, GPT_SETTINGS.STORY_MODEL)
+
+def is_tiered(endpoint: str) -> bool:
+    return endpoint in GPT_SETTINGS.STORY_TIERED_ENDPOINTS
+
+def _image_transport(file_url: str) -> str:
+    return "inline" if file_url.startswith("data:") else "url"
+
+def _record_usage(operation: str, started_at: float, usage, estimated: int | None = None, **extra) -> None:
+    """OpenAI 호출 한 번의 지연 시간과 usage 를 로그와 METRICS 에 기록합니다."""
+    latency_ms = (time.perf_counter() - started_at) * 1000
+    METRICS.incr(f"openai.{operation}.calls")
+    METRICS.observe(f"openai.{operation}.latency_ms", latency_ms)
+    for key, value in extra.items():
+        METRICS.observe(f"openai.{operation}.{key}", value)
+    if usage is not None:
+        METRICS.observe(f"openai.{operation}.prompt_tokens", usage.prompt_tokens)
+        METRICS.observe(f"openai.{operation}.completion_tokens", usage.completion_tokens)
+        METRICS.observe(f"openai.{operation}.total_tokens", usage.total_tokens)
+    extras = "".join(f" {key}={value:.0f}" for key, value in extra.items())
+    logger.info(
+        f"{operation}: {latency_ms:.0f}ms{extras} estimated={estimated if estimated is not None else '-'} "
+        f"prompt={usage.prompt_tokens if usage else '-'} completion={usage.completion_tokens if usage else '-'}"
     )
 
+def _hedge_delay(histogram: str) -> float | None:
+    """hedge 를 보내기까지 기다릴 시간(초). hedge 를 끄거나 샘플이 모자라면 None."""
+    if not GPT_SETTINGS.HEDGE_ENABLED:
+        return None
+    latency_ms = METRICS.percentile(histogram, GPT_SETTINGS.HEDGE_PERCENTILE, GPT_SETTINGS.HEDGE_MIN_SAMPLES)
+    if latency_ms is None:
+        return None
+    return max(latency_ms / 1000, GPT_SETTINGS.HEDGE_MIN_DELAY)
+
+async def _hedged(call: Callable[[], Awaitable[T]], delay: float | None) -> T:
+    """
+    첫 호출이 delay 초 안에 끝나지 않으면 같은 호출을 한 번 더 보내 먼저 성공한 쪽 결과를 사용합니다.
+    진 쪽은 취소합니다. delay 가 None 이거나 스케줄러에 대기 중인 호출이 있으면 hedge 하지 않습니다.
+    """
+    if delay is None:
+        return await call()
+
+    primary = asyncio.ensure_future(call())
+    pending = {primary}
+    hedged = False
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            if SCHEDULER.saturated:
+                METRICS.incr("openai.hedge.skipped")
+            else:
+                hedged = True
+                METRICS.incr("openai.hedge.launched")
+                pending.add(asyncio.ensure_future(call()))
+
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    if hedged:
+                        METRICS.incr("openai.hedge.won_primary" if task is primary else "openai.hedge.won_hedge")
+                    return task.result()
+                error = task.exception()
+        if hedged:
+            METRICS.incr("openai.hedge.failed")
+        if error is None:
+            # 모든 호출이 결과 없이 취소됨
+            raise asyncio.CancelledError()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def generate_continuous_story(
+    previous_stories: list[str],
+    file_url: str,              # presigned URL 또는 이미지 바이트를 담은 data: URL
+    content_type: str,          # 이미지의 MIME 타입 (예: "image/png")
+    keywords: str | None = None,
+    user_query: str | None = None,
+    summary: str | None = None,
+    user_id: int | None = None,
+    model: str | None = None,
+) -> str:
+    """
+    - previous_stories: 이전에 생성된 스토리들 (summary 가 있으면 요약 이후의 최근 스토리만)
+    - file_url: S3에 올린 이미지의 URL, 또는 작은 축소본을 직접 담은 data URL
+    - content_type: file.content_type
+    - keywords, user_query: optional 추가 컨텍스트
+    - summary: 오래된 스토리들을 접어 둔 챕터 요약
+    - user_id: 요청한 사용자. 스케줄러가 사용자별로 공평하게 호출 순서를 정하는 데 사용
+    - model: 사용할 모델 (기본 STORY_MODEL)
+    """
+    model = model or GPT_SETTINGS.STORY_MODEL
+    messages, estimated = _build_messages_within_budget(
+        previous_stories, file_url, keywords, user_query, summary
+    )
+
+    # GPT-4o 호출
+    started_at = time.perf_counter()
+    reserved = estimated + GPT_SETTINGS.COMPLETION_TOKEN_ESTIMATE
+
+    async def request():
+        request_started_at = time.perf_counter()
+        resp = await client.chat.completions.create(
+            model=model,
+            messages=messages
+        )
+        # 대기열 시간을 뺀 모델 응답 시간
+        return resp, (time.perf_counter() - request_started_at) * 1000
+
+    try:
+        resp, model_ms = await _hedged(
+            lambda: SCHEDULER.execute(user_id, reserved, request),
+            _hedge_delay(f"openai.generate_continuous_story.model_ms.{model}"),
+        )
+    except Exception:
+        METRICS.incr("openai.generate_continuous_story.errors")
+        raise
+    SCHEDULER.record_usage(reserved, resp.usage)
+    # 모델 응답 시간을 이미지 전송 방식(inline / url)별로 따로 기록해 비교할 수 있게 함
+    METRICS.observe(f"openai.generate_continuous_story.model_ms.{_image_transport(file_url)}", model_ms)
+    METRICS.observe(f"openai.generate_continuous_story.model_ms.{model}", model_ms)
+    _record_usage("generate_continuous_story", started_at, resp.usage, estimated, model_ms=model_ms)
+
     # 결과 반환
     return resp.choices[0].message.content.strip()
+
+async def stream_continuous_story(
+    previous_stories: list[str],
+    file_url: str,
+    content_type: str,
+    keywords: str | None = None,
+    user_query: str | None = None,
+    summary: str | None = None,
+    user_id: int | None = None,
+    model: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    generate_continuous_story 의 스트리밍 버전. 생성되는 텍스트 조각(delta)을 순서대로 yield 합니다.
+    호출자가 중간에 멈추면 OpenAI 스트림도 닫습니다.
+    """
+    model = model or GPT_SETTINGS.STORY_MODEL
+    messages, estimated = _build_messages_within_budget(
+        previous_stories, file_url, keywords, user_query, summary
+    )
+
+    started_at = request_started_at = time.perf_counter()
+    first_token_ms: float | None = None
+    usage = None
+    reserved = estimated + GPT_SETTINGS.COMPLETION_TOKEN_ESTIMATE
+
+    async def request():
+        nonlocal request_started_at
+        request_started_at = time.perf_counter()
+        return await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+    try:
+        stream = await SCHEDULER.open(user_id, reserved, request)
+    except Exception:
+        METRICS.incr("openai.stream_continuous_story.errors")
+        raise
+    try:
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - request_started_at) * 1000
+                    METRICS.observe(
+                        f"openai.stream_continuous_story.ttft_ms.{_image_transport(file_url)}", first_token_ms
+                    )
+                yield delta
+    finally:
+        try:
+            await stream.close()
+        finally:
+            SCHEDULER.release()
+        SCHEDULER.record_usage(reserved, usage)
+        _record_usage("stream_continuous_story", started_at, usage, estimated, ttft_ms=first_token_ms or 0)
+
+async def _complete(operation: str, model: str, messages: list[dict], queue_key: str, **extra) -> str:
+    """스토리 생성 외의 짧은 텍스트 작업(요약 등)을 스케줄러를 거쳐 호출하고 결과 텍스트를 반환합니다."""
+    reserved = estimate_message_tokens(messages, 0) + GPT_SETTINGS.COMPLETION_TOKEN_ESTIMATE
+    started_at = time.perf_counter()
+    try:
+        resp = await SCHEDULER.execute(queue_key, reserved, lambda: client.chat.completions.create(
+            model=model,
+            messages=messages,
+        ))
+    except Exception:
+        METRICS.incr(f"openai.{operation}.errors")
+        raise
+    SCHEDULER.record_usage(reserved, resp.usage)
+    _record_usage(operation, started_at, resp.usage, **extra)
+    return resp.choices[0].message.content.strip()
+
+async def summarize_stories(summary: str | None, stories: list[str]) -> str:
+    """
+    기존 요약에 새 스토리들을 덧붙여 하나의 요약으로 다시 씁니다.
+    스토리 생성 프롬프트가 챕터 길이에 비례해 커지지 않도록 오래된 스토리를 접는 데 사용합니다.
+    """
+    parts = []
+    if summary:
+        parts.append(f"기존 요약:\n{summary}")
+    parts.append("새 스토리(순서대로):\n" + "\n---\n".join(stories))
+
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "당신은 회고록의 흐름을 정리하는 어시스턴트입니다. "
+                "기존 요약과 새 스토리를 합쳐, 등장인물·장소·시간 순서·감정선이 드러나도록 "
+                "1인칭 시점의 요약을 10문장 이내로 작성해 주세요."
+            ),
+        },
+        {"role": "user", "content": "\n\n".join(parts)},
+    ]
+    # 백그라운드 작업이므로 사용자 대신 별도 키("background")로 대기열에 넣습니다
+    return await _complete("summarize_stories", GPT_SETTINGS.SUMMARY_MODEL, messages, "background", stories=len(stories))
+
+async def merge_summaries(summaries: list[str]) -> str:
+    """순서대로 이어지는 구간 요약들을 하나의 요약으로 합칩니다 (map-reduce 의 reduce 단계)."""
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "당신은 회고록의 흐름을 정리하는 어시스턴트입니다. "
+                "시간 순서대로 이어지는 여러 구간의 요약을 하나로 합쳐, 중요한 사건과 감정선이 빠지지 않도록 "
+                "1인칭 시점의 요약을 10문장 이내로 작성해 주세요."
+            ),
+        },
+        {"role": "user", "content": "구간 요약(순서대로):\n\n" + "\n---\n".join(summaries)},
+    ]
+    return await _complete("merge_summaries", GPT_SETTINGS.SUMMARY_MODEL, messages, "background", parts=len(summaries))
+
+async def write_chapter_bookend(kind: str, chapter_name: str, summary: str) -> str:
+    """
+    챕터 전체 요약으로 prologue(kind="prologue") 또는 epilogue(kind="epilogue") 를 작성합니다.
+    """
+    instruction = (
+        "이 챕터를 여는 프롤로그를, 앞으로 펼쳐질 기억을 예고하듯 한 문단으로 작성해 주세요."
+        if kind == "prologue"
+        else "이 챕터를 마무리하는 에필로그를, 지나온 기억을 돌아보며 여운이 남도록 한 문단으로 작성해 주세요."
+    )
+    messages = [
+        {
+            "role": "system",
+            "content": "당신은 사용자가 업로드한 사진으로 회고록을 생성하는 어시스턴트입니다. 1인칭 시점으로 작성해 주세요.",
+        },
+        {"role": "user", "content": f"챕터 제목: {chapter_name}\n\n챕터 요약:\n{summary}"},
+        {"role": "user", "content": instruction},
+    ]
+    return await _complete(f"write_{kind}", GPT_SETTINGS.BOOKEND_MODEL, messages, "background")
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+
+import aioboto3
+import boto3
+from aiobotocore.config import AioConfig
+
+from memory.database.settings import AWS_SETTINGS
+
+
+class S3ClientManager:
+    """
+    앱 전체에서 공유하는 S3 클라이언트.
+    요청마다 세션/클라이언트를 새로 만들지 않고, 앱 시작 시 한 번 열어 커넥션 풀을 재사용합니다.
+    """
+
+    def __init__(self):
+        self.session = aioboto3.Session(
+            aws_access_key_id=AWS_SETTINGS.access_key_id,
+            aws_secret_access_key=AWS_SETTINGS.secret_access_key,
+            region_name=AWS_SETTINGS.default_region,
+        )
+        self._exit_stack: AsyncExitStack | None = None
+        self._client = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._lock:
+            if self._client is not None:
+                return self._client
+            if AWS_SETTINGS.s3_backend == "memory":
+                from memory.fake.s3 import InMemoryS3Client
+                self._client = InMemoryS3Client()
+                return self._client
+            exit_stack = AsyncExitStack()
+            self._client = await exit_stack.enter_async_context(
+                self.session.client(
+                    "s3",
+                    endpoint_url=AWS_SETTINGS.s3_endpoint_url,
+                    config=AioConfig(max_pool_connections=AWS_SETTINGS.s3_max_pool_connections),
+                )
+            )
+            self._exit_stack = exit_stack
+            return self._client
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+
+    async def get_client(self):
+        """lifespan 밖(스크립트 등)에서 호출되어도 동작하도록 필요 시 지연 생성합니다."""
+        if self._client is None:
+            return await self.start()
+        return self._client
+
+
+S3_CLIENT = S3ClientManager()
+
+
+class PresignedURLCache:
+    """
+    S3 key 에 대한 presigned GET URL 캐시.
+    서명은 로컬 CPU 작업(HMAC)이지만 챕터 조회마다 수백 개를 다시 서명하지 않도록,
+    만료가 가까워지기 전까지는 캐시된 URL 을 그대로 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._urls: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def _get_client(self):
+        # 서명은 네트워크 I/O 가 없으므로 동기 boto3 클라이언트로 처리합니다.
+        if self._client is None:
+            self._client = boto3.session.Session(
+                aws_access_key_id=AWS_SETTINGS.access_key_id,
+                aws_secret_access_key=AWS_SETTINGS.secret_access_key,
+                region_name=AWS_SETTINGS.default_region,
+            ).client("s3", endpoint_url=AWS_SETTINGS.s3_endpoint_url)
+        return self._client
+
+    def get_url(self, key: str | None) -> str | None:
+        if key is None:
+            return None
+
+        now = time.monotonic()
+        cached = self._urls.get(key)
+        if cached is not None and cached[1] - now > AWS_SETTINGS.s3_presign_refresh_margin:
+            self._urls.move_to_end(key)
+            return cached[0]
+
+        url = self._get_client().generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": AWS_SETTINGS.s3_bucket, "Key": key},
+            ExpiresIn=AWS_SETTINGS.s3_presign_expires_in,
+        )
+        self._urls[key] = (url, now + AWS_SETTINGS.s3_presign_expires_in)
+        self._urls.move_to_end(key)
+        while len(self._urls) > AWS_SETTINGS.s3_presign_cache_size:
+            self._urls.popitem(last=False)
+        return url
+
+
+PRESIGNED_URLS = PresignedURLCache()
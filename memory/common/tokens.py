@@ -0,0 +1,42 @@
+# tiktoken 같은 외부 토크나이저 없이 프롬프트 크기를 가늠하기 위한 근사치 계산.
+# 실제 사용량은 응답의 usage 로 기록되므로, 여기서는 예산 초과 여부를 판단할 정도로만 보수적으로 셉니다.
+
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+
+def estimate_tokens(text: str | None) -> int:
+    """
+    ASCII 는 약 4글자당 1토큰, 한글/한자 등은 1글자당 1토큰, 그 외 문자는 2글자당 1토큰으로 셉니다.
+    """
+    if not text:
+        return 0
+    ascii_chars = 0
+    wide_chars = 0
+    other_chars = 0
+    for ch in text:
+        code = ord(ch)
+        if code < 128:
+            ascii_chars += 1
+        elif 0xAC00 <= code <= 0xD7A3 or 0x3130 <= code <= 0x318F or 0x4E00 <= code <= 0x9FFF:
+            wide_chars += 1
+        else:
+            other_chars += 1
+    return (ascii_chars + 3) // 4 + wide_chars + (other_chars + 1) // 2
+
+
+def estimate_message_tokens(messages: list[dict], image_tokens: int) -> int:
+    """chat.completions 의 messages 전체에 대한 토큰 수 추정치. 이미지 블록은 image_tokens 로 계산합니다."""
+    total = REPLY_PRIMING_TOKENS
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS
+        content = message["content"]
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+            continue
+        for block in content:
+            if block["type"] == "text":
+                total += estimate_tokens(block["text"])
+            elif block["type"] == "image_url":
+                total += image_tokens
+    return total
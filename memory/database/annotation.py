@@ -1,29 +1,88 @@
-from memory.database.connection import SESSION, reset_session, start_new_session_if_not_exists
+from memory.database.connection import (
+    SESSION,
+    can_read_from_replica,
+    in_transaction,
+    reset_session,
+    start_new_session_if_not_exists,
+    stick_to_primary,
+)
 
 
+import asyncio
 from functools import wraps
 from typing import Awaitable, Callable, ParamSpec, TypeVar
+from loguru import logger
+from sqlalchemy.exc import DBAPIError
+
+from memory.common.metrics import METRICS
 
 P = ParamSpec("P")
 RT = TypeVar("RT")
 
 
-def transactional(f: Callable[P, Awaitable[RT]]) -> Callable[P, Awaitable[RT]]:
+def transactional(
+    f: Callable[P, Awaitable[RT]] | None = None, *, read_only: bool = False
+) -> Callable[P, Awaitable[RT]] | Callable[[Callable[P, Awaitable[RT]]], Callable[P, Awaitable[RT]]]:
+    """
+    최상위 호출마다 세션을 새로 열어 끝나면 commit(실패 시 rollback) 하고, 중첩 호출은 바깥 세션을 그대로 씁니다.
+    @transactional(read_only=True) 는 replica 가 설정돼 있고 현재 요청에서 아직 쓰기가 없으면 replica 에서 읽습니다.
+    쓰기가 있었던 트랜잭션이 commit 되면 같은 요청의 이후 읽기는 primary 로 갑니다.
+    """
+    def decorator(f: Callable[P, Awaitable[RT]]) -> Callable[P, Awaitable[RT]]:
+        @wraps(f)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> RT:
+            tokens = start_new_session_if_not_exists()
+            # 이미 현재 태스크에서 생성된 세션이 있는 경우 tokens 는 None
+            if tokens is None:
+                return await f(*args, **kwargs)
+            if read_only and can_read_from_replica():
+                SESSION.info["read_only"] = True
+            failed = True
+            try:
+                ret = await f(*args, **kwargs)
+                await SESSION.commit()
+                failed = False
+                if SESSION.info.get("wrote"):
+                    stick_to_primary()
+            finally:
+                # gather_or_cancel 등으로 DB 호출 도중 취소돼도 rollback 과 remove 가 끝까지 실행되도록 shield
+                try:
+                    await asyncio.shield(_close_session(rollback=failed))
+                finally:
+                    reset_session(tokens)
+            return ret
+        return wrapper
+
+    if f is not None:
+        return decorator(f)
+    return decorator
+
+
+async def _close_session(rollback: bool) -> None:
+    try:
+        if rollback:
+            await SESSION.rollback()
+    finally:
+        # close 만 하면 scoped registry 에 세션 id 별 항목이 계속 쌓이므로 remove 로 정리
+        await SESSION.remove()
+
+
+def retry_on_disconnect(f: Callable[P, Awaitable[RT]]) -> Callable[P, Awaitable[RT]]:
+    """
+    끊어진 커넥션을 받아 실패한 읽기 전용 호출을 새 커넥션으로 한 번 다시 실행합니다 (pool_pre_ping 을 끈 경우 대비).
+    SQLAlchemy 가 연결 끊김으로 판단해 커넥션을 무효화한 경우에만 재시도하고,
+    바깥 트랜잭션 안에서 호출됐다면 그 트랜잭션이 이미 깨졌으므로 그대로 실패시킵니다.
+    부작용 없는 메서드의 @transactional 바깥에 붙입니다.
+    """
     @wraps(f)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> RT:
-        tokens = start_new_session_if_not_exists()
-        # 이미 현재 태스크에서 생성된 세션이 있는 경우 tokens 는 None
-        if tokens is None:
-            return await f(*args, **kwargs)
+        nested = in_transaction()
         try:
-            ret = await f(*args, **kwargs)
-        except Exception as e:
-            await SESSION.rollback()
-            raise e
-        else:
-            await SESSION.commit()
-        finally:
-            await SESSION.close()
-            reset_session(tokens)
-        return ret
-    return wrapper
\ No newline at end of file
+            return await f(*args, **kwargs)
+        except DBAPIError as e:
+            if nested or not e.connection_invalidated:
+                raise
+            logger.warning(f"끊어진 DB 커넥션, 다시 시도: {f.__qualname__}")
+            METRICS.incr("db.disconnect_retries")
+            return await f(*args, **kwargs)
+    return wrapper
@@ -1,26 +1,152 @@
 import asyncio
+import time
 from contextvars import ContextVar, Token
 from uuid import uuid4
-from sqlalchemy import AsyncAdaptedQueuePool
+from sqlalchemy import AsyncAdaptedQueuePool, event, exc
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import (
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
 
+from memory.common.metrics import METRICS
 from memory.database.settings import DB_SETTINGS
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    커넥션을 얻기까지 기다린 시간(새로 연결하는 시간 포함)과 타임아웃 횟수를 METRICS 에 기록하는 풀.
+    공개 풀 이벤트에는 체크아웃을 기다리기 시작한 시점이 없어 이 두 가지만 _do_get 을 감싸 잽니다.
+    SQLAlchemy 내부 메서드에 기대므로 pyproject 에서 2.0.x 로 고정해 둡니다.
+    나머지 메트릭은 _instrument_pool 이 공개 이벤트(connect / checkout / checkin)로 기록합니다.
+    """
+
+    metrics_prefix = "db.pool"
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            METRICS.incr(f"{self.metrics_prefix}.timeouts")
+            raise
+        finally:
+            METRICS.observe(f"{self.metrics_prefix}.wait_ms", (time.perf_counter() - started_at) * 1000)
+
+    def stats(self) -> dict:
+        checked_out = self.checkedout()
+        return {
+            "size": DB_SETTINGS.pool_size,
+            "max_overflow": DB_SETTINGS.max_overflow,
+            "timeout": DB_SETTINGS.pool_timeout,
+            "checked_out": checked_out,
+            "checked_in": self.checkedin(),
+            "overflow": max(checked_out - DB_SETTINGS.pool_size, 0),
+        }
+
+
+class ReplicaQueuePool(InstrumentedQueuePool):
+    metrics_prefix = "db.replica_pool"
+
+
+def _instrument_pool(engine, metrics_prefix: str) -> None:
+    """
+    새 연결 수, 체크아웃 수, 사용 중인 커넥션 수, overflow 사용량을 공개 풀 이벤트로 METRICS 에 기록합니다.
+    워커당 풀 크기를 실제 사용량을 보고 정할 수 있도록 /internal/db-pool 에서 조회합니다.
+    """
+    pool = engine.pool
+
+    def update_gauges(checked_out: int) -> None:
+        METRICS.set_gauge(f"{metrics_prefix}.checked_out", checked_out)
+        METRICS.set_gauge(f"{metrics_prefix}.overflow", max(checked_out - DB_SETTINGS.pool_size, 0))
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _count_connect(dbapi_connection, connection_record) -> None:
+        METRICS.incr(f"{metrics_prefix}.connects")
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        METRICS.incr(f"{metrics_prefix}.checkouts")
+        update_gauges(pool.checkedout())
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _count_checkin(dbapi_connection, connection_record) -> None:
+        # checkin 이벤트는 풀에 돌려놓기 직전에 불리므로 돌아오는 커넥션을 빼고 셈
+        update_gauges(max(pool.checkedout() - 1, 0))
+
+
+class RoutingSession(Session):
+    """
+    info["read_only"] 로 표시된 세션은 replica 엔진으로, 그 외에는 primary 엔진으로 보냅니다.
+    엔진은 session_factory 의 info 로 전달됩니다.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("read_only") and self.info["replica"] is not None:
+            return self.info["replica"]
+        return self.info["primary"]
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def _recycle_idle_connections(engine, metrics_prefix: str) -> None:
+    """
+    풀에 pool_idle_timeout 초 넘게 쉬고 있던 커넥션은 체크아웃할 때 DisconnectionError 로 버리고 새로 연결합니다.
+    풀이 직접 무효화하고 다시 연결하므로 다른 코루틴이 쓰는 커넥션이나 풀 객체는 건드리지 않습니다.
+    pre-ping 없이도 DB 서버가 먼저 끊은 커넥션을 받는 일을 줄이며, 오래된 커넥션 전체의 수명은 pool_recycle 이 맡습니다.
+    """
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _record_checkin(dbapi_connection, connection_record) -> None:
+        if connection_record is not None:
+            connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _discard_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is not None and time.monotonic() - checked_in_at > DB_SETTINGS.pool_idle_timeout:
+            METRICS.incr(f"{metrics_prefix}.idle_recycled")
+            raise exc.DisconnectionError("idle connection")
+
+
+def _create_engine(url: str, poolclass: type[InstrumentedQueuePool]):
+    engine = create_async_engine(
+        url,
+        poolclass=poolclass,
+        pool_size=DB_SETTINGS.pool_size,
+        max_overflow=DB_SETTINGS.max_overflow,
+        pool_timeout=DB_SETTINGS.pool_timeout,
+        pool_recycle=DB_SETTINGS.pool_recycle,
+        pool_pre_ping=DB_SETTINGS.pool_pre_ping,
+    )
+    _instrument_pool(engine, poolclass.metrics_prefix)
+    if DB_SETTINGS.pool_idle_timeout > 0:
+        _recycle_idle_connections(engine, poolclass.metrics_prefix)
+    return engine
+
+
 class DatabaseManager:
     def __init__(self):
-        self.engine = create_async_engine(
-            DB_SETTINGS.url,
-            poolclass=AsyncAdaptedQueuePool,
-            pool_recycle=28000,
-            pool_pre_ping=True,
-        )
+        self.engine = _create_engine(DB_SETTINGS.url, InstrumentedQueuePool)
+        replica_url = DB_SETTINGS.replica_url
+        self.replica_engine = _create_engine(replica_url, ReplicaQueuePool) if replica_url else None
         self.session_factory = async_sessionmaker(
-            bind=self.engine, expire_on_commit=False
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            info={
+                "primary": self.engine.sync_engine,
+                "replica": self.replica_engine.sync_engine if self.replica_engine else None,
+            },
         )
 
 
@@ -29,6 +155,11 @@ session_context_var: ContextVar[tuple[str | None, str | None]] = ContextVar(
 )
 
 
+# 요청 안에서 primary 에 쓴 적이 있으면 이후 읽기도 primary 로 보냄 (read-your-writes).
+# gather 등으로 만든 자식 태스크에서 쓴 것도 보이도록 값 대신 요청마다 새 dict 를 담습니다.
+request_state_var: ContextVar[dict | None] = ContextVar("request_state", default=None)
+
+
 def reset_session(token: Token) -> None:
     """세션 컨텍스트 초기화"""
     session_context_var.reset(token)
@@ -39,6 +170,29 @@ def start_default_session() -> Token:
     return session_context_var.set((uuid4().hex, None))
 
 
+def start_request_state() -> Token:
+    """DefaultSessionMiddleware 에서 요청마다 한 번 사용"""
+    return request_state_var.set({"primary": False})
+
+
+def reset_request_state(token: Token) -> None:
+    request_state_var.reset(token)
+
+
+def stick_to_primary() -> None:
+    """현재 요청의 이후 읽기를 모두 primary 로 보냅니다. 요청 밖(백그라운드 작업)에서는 아무 일도 하지 않습니다."""
+    state = request_state_var.get()
+    if state is not None:
+        state["primary"] = True
+
+
+def can_read_from_replica() -> bool:
+    if DB.replica_engine is None:
+        return False
+    state = request_state_var.get()
+    return state is None or not state["primary"]
+
+
 def start_new_session_if_not_exists() -> Token | None:
     """
     트랜잭션 시작 시 새로운 세션 컨텍스트 생성
@@ -55,6 +209,28 @@ def get_session_id() -> str | None:
     return session_context_var.get()[0]
 
 
+def in_transaction() -> bool:
+    """현재 태스크에서 @transactional 로 연 트랜잭션 안인지 여부"""
+    _, session_task = session_context_var.get()
+    return session_task is not None and session_task == asyncio.current_task().get_name()  # type: ignore
+
+
+DB = DatabaseManager()
+
 SESSION = async_scoped_session(
-    session_factory=DatabaseManager().session_factory, scopefunc=get_session_id
-)
\ No newline at end of file
+    session_factory=DB.session_factory, scopefunc=get_session_id
+)
+
+
+async def release_session() -> None:
+    """
+    요청 세션을 커밋하고 닫아 커넥션을 풀에 돌려줍니다.
+    S3 업로드나 모델 호출처럼 오래 걸리는 외부 I/O 전에 호출하면 그동안 커넥션을 붙잡지 않습니다.
+    이후 결과 저장은 @transactional 메서드가 새 커넥션으로 짧은 트랜잭션을 열어 처리합니다.
+    @transactional 안에서는 호출하지 않습니다.
+    """
+    if SESSION.registry.has():
+        await SESSION.commit()
+        if SESSION.info.get("wrote"):
+            stick_to_primary()
+        await SESSION.remove()
\ No newline at end of file
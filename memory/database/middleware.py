@@ -1,18 +1,41 @@
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from memory.database.connection import SESSION, reset_session, start_default_session
+from memory.database.connection import (
+    SESSION,
+    reset_request_state,
+    reset_session,
+    start_default_session,
+    start_request_state,
+)
 
 
-class DefaultSessionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
+class DefaultSessionMiddleware:
+    """
+    요청마다 기본 세션 컨텍스트와 read-your-writes 상태를 엽니다. 세션은 SESSION 을 처음 쓸 때 만들어지고,
+    요청 중 세션이 만들어진 경우에만 응답 헤더를 보내기 직전에 commit 하고 요청이 끝나면 정리(remove)합니다.
+    BaseHTTPMiddleware 와 달리 별도 태스크나 응답 스트림 래핑 없이 ASGI 호출을 그대로 넘깁니다.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_commit(message: Message) -> None:
+            # 클라이언트가 응답을 받은 뒤 바로 보낸 요청에서도 변경 사항이 보이도록 응답 전에 commit
+            if message["type"] == "http.response.start" and SESSION.registry.has():
+                await SESSION.commit()
+            await send(message)
+
         tokens = start_default_session()
+        state_token = start_request_state()
         try:
-            response = await call_next(request)
-        except Exception as e:
-            raise e
-        else:
-            await SESSION.commit()
+            await self.app(scope, receive, send_after_commit)
         finally:
-            await SESSION.close()
+            if SESSION.registry.has():
+                await SESSION.remove()
+            reset_request_state(state_token)
             reset_session(tokens)
-        return response
\ No newline at end of file
@@ -9,11 +9,30 @@ class DatabaseSettings(BaseSettings):
     user: str = ""
     password: str = ""
     database: str = ""
+    # 커넥션 풀 (워커 프로세스마다 따로 생김: 전체 최대 커넥션 = 워커 수 × (pool_size + max_overflow))
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0  # 풀이 가득 찼을 때 커넥션을 기다리는 최대 시간(초)
+    pool_recycle: int = 28000  # 이 시간(초)보다 오래된 커넥션은 다시 연결 (MySQL wait_timeout 보다 짧게)
+    # true: 체크아웃마다 SELECT 1 로 확인 / false: 확인 없이 쓰고, 끊어진 커넥션은 읽기 경로에서 무효화 후 한 번 재시도
+    pool_pre_ping: bool = True
+    pool_idle_timeout: int = 600  # 이 시간(초) 넘게 풀에서 쉬던 커넥션은 다음 체크아웃 때 버리고 새로 연결 (0 이면 끔)
+
+    # 읽기 전용 replica. 비워 두면 모든 쿼리가 primary 로 감 (계정/DB 이름은 primary 와 같음)
+    replica_host: str = ""
+    replica_port: int = 0  # 0 이면 port 와 같음
 
     @property
     def url(self) -> str:
         return f"{self.dialect}+{self.driver}://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
+    @property
+    def replica_url(self) -> str | None:
+        if not self.replica_host:
+            return None
+        port = self.replica_port or self.port
+        return f"{self.dialect}+{self.driver}://{self.user}:{self.password}@{self.replica_host}:{port}/{self.database}"
+
     model_config = SettingsConfigDict(
         case_sensitive=False,
         env_prefix="DB_",
@@ -25,14 +44,139 @@ class AWSSettings(BaseSettings):
     secret_access_key: str 
     default_region: str
     s3_bucket: str 
+    s3_max_pool_connections: int = 50  # 공유 S3 클라이언트의 커넥션 풀 크기
+    s3_multipart_part_size: int = 8 * 1024 * 1024  # 멀티파트 파트 크기 (S3 최소 5MiB), 이보다 작은 파일은 put_object 한 번으로 업로드
+    s3_multipart_concurrency: int = 4  # 업로드 하나당 동시에 전송하는 파트 수
+    s3_presign_expires_in: int = 3600  # presigned GET URL 유효 시간(초)
+    s3_presign_refresh_margin: int = 300  # 만료까지 이 시간(초)보다 적게 남으면 새로 서명
+    s3_presign_cache_size: int = 10000  # 캐시에 보관할 presigned URL 최대 개수
+    s3_presign_post_expires_in: int = 600  # 브라우저 직접 업로드용 presigned POST 유효 시간(초)
+    s3_upload_max_bytes: int = 20 * 1024 * 1024  # 브라우저 직접 업로드 허용 최대 크기
+    s3_backend: str = "s3"  # s3: 실제 S3(또는 s3_endpoint_url 의 호환 서버) / memory: 프로세스 내 가짜 S3 (부하 테스트용)
+    s3_endpoint_url: str | None = None  # MinIO, moto 등 S3 호환 서버 주소
     model_config = SettingsConfigDict(
         case_sensitive=False,
         env_prefix="AWS_",
         env_file=".env.aws",
     )
 
+class ImageSettings(BaseSettings):
+    preprocess_enabled: bool = True  # 모델 입력용 축소본 생성 여부
+    model_max_edge: int = 1024  # 축소본의 긴 변 최대 픽셀
+    model_jpeg_quality: int = 85
+    preprocess_workers: int = 2  # 디코딩/리사이즈용 프로세스 수
+    # 축소본을 만들려고 메모리에 읽어 들이는 원본 최대 크기. 더 크면 축소하지 않고 원본을 모델 입력으로 사용
+    preprocess_max_bytes: int = 16 * 1024 * 1024
+    batch_max_files: int = 30  # 배치 업로드 한 번에 받을 수 있는 최대 사진 수
+    batch_upload_concurrency: int = 4  # 배치 업로드에서 동시에 S3 로 올리는 사진 수
+    # 모델에 이미지를 넘기는 방식. auto: 축소본이 메모리에 있고 inline_max_bytes 이하면 data URL 로 직접 전송,
+    # 그 외에는 presigned URL / url: 항상 presigned URL (OpenAI 가 S3 에서 내려받음)
+    transport: str = "auto"
+    inline_max_bytes: int = 512 * 1024
+    # /upload 에 chapter_id 를 함께 보내면 업로드 직후 스토리 생성을 미리 시작 (추측 생성)
+    speculative_enabled: bool = False
+    speculative_ttl: float = 120  # 이 시간(초) 안에 /create 가 가져가지 않으면 결과를 버림
+    speculative_max_pending: int = 500  # 프로세스당 보관하는 추측 생성 최대 개수, 넘으면 새로 시작하지 않음
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="IMAGE_",
+        env_file=SETTINGS.env_file,
+    )
+
+class JobSettings(BaseSettings):
+    concurrency: int = 4  # 프로세스당 동시에 처리하는 스토리 생성 작업 수
+    poll_interval: float = 2.0  # 대기 중인 작업을 확인하는 주기(초)
+    stale_after: int = 300  # running 상태로 이 시간(초)이 지나면 멈춘 작업으로 보고 다시 대기열에 넣음
+    max_attempts: int = 3
+    # 실패한 작업은 retry_base_delay × 2^(시도 횟수-1) (최대 retry_max_delay, jitter 포함) 뒤에 다시 가져감
+    retry_base_delay: float = 5.0
+    retry_max_delay: float = 300.0
+    long_poll_max: int = 30  # 상태 조회 long-poll 최대 대기 시간(초)
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="JOB_",
+        env_file=SETTINGS.env_file,
+    )
+
+class ChapterSettings(BaseSettings):
+    bookend_trigger_images: int = 5  # 마지막 prologue/epilogue 이후 이만큼 스토리가 늘면 다시 생성
+    bookend_debounce: float = 30.0  # 마지막 스토리 저장 후 이 시간(초) 동안 새 스토리가 없으면 생성 시작
+    bookend_concurrency: int = 2  # 동시에 prologue/epilogue 를 생성하는 챕터 수
+    bookend_chunk_size: int = 8  # map 단계에서 한 번에 요약하는 스토리 수 (reduce 단계의 fan-in 도 동일)
+    bookend_map_concurrency: int = 4  # map/reduce 단계에서 동시에 진행하는 요약 수
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="CHAPTER_",
+        env_file=SETTINGS.env_file,
+    )
+
+class IdempotencySettings(BaseSettings):
+    backend: str = "memory"  # memory: 프로세스 내 캐시 / db: 여러 워커가 idempotency_record 테이블을 공유
+    ttl: int = 600  # 완료된 응답을 재전송하는 시간(초). 응답의 presigned URL 유효 시간보다 짧게 유지
+    wait_timeout: float = 120  # 처리 중인 같은 키의 요청을 기다리는 최대 시간(초), 넘으면 409
+    pending_timeout: int = 300  # (db) pending 기록이 이 시간(초)을 넘기면 처리하던 워커가 죽은 것으로 보고 다시 처리
+    poll_interval: float = 0.5  # (db) 다른 워커가 처리 중인 요청의 완료를 확인하는 주기(초)
+    cache_size: int = 10000  # 프로세스 내 캐시에 보관할 응답 최대 개수
+    max_key_length: int = 255
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="IDEMPOTENCY_",
+        env_file=SETTINGS.env_file,
+    )
+
 class GPTSettings(BaseSettings):
+    """
+    OpenAI 호출 설정. 스케줄러의 동시성/RPM/TPM 제한은 프로세스마다 따로 적용됩니다.
+    워커를 여러 개 띄우면 계정 한도를 워커 수로 나눈 값을 RPM_LIMIT/TPM_LIMIT 에 넣어야 합니다.
+    """
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: str | None = None  # OpenAI 호환 서버 주소 (부하 테스트 시 memory.fake.openai_server)
+    # full: 이전 스토리 전체를 프롬프트에 넣음 / summary: 챕터 요약 + 최근 STORY_RECENT_COUNT 개만 넣음
+    STORY_CONTEXT_MODE: str = "summary"
+    STORY_RECENT_COUNT: int = 3
+    SUMMARY_CONCURRENCY: int = 2  # 동시에 진행하는 챕터 요약 갱신 수
+    # 스토리 생성 프롬프트의 추정 토큰 상한. 넘으면 오래된 스토리부터 덜어냄
+    PROMPT_TOKEN_BUDGET: int = 6000
+    IMAGE_TOKEN_ESTIMATE: int = 765  # 이미지 한 장의 추정 토큰 수 (detail=high, 1024px 기준)
+    # 스토리 생성 모델. STORY_ENDPOINT_MODELS 로 엔드포인트(create, finalize, batch, stream, job)별로 바꿀 수 있음
+    STORY_MODEL: str = "gpt-4o"
+    STORY_ENDPOINT_MODELS: dict[str, str] = {}
+    # 티어드 모드: 여기 있는 엔드포인트(create, finalize)는 STORY_DRAFT_MODEL 로 만든 초안을 바로 돌려주고,
+    # 백그라운드 작업이 엔드포인트의 스토리 모델로 다시 생성해 내용을 교체함
+    STORY_TIERED_ENDPOINTS: list[str] = []
+    STORY_DRAFT_MODEL: str = "gpt-4o-mini"
+    SUMMARY_MODEL: str = "gpt-4o-mini"  # 챕터 요약(map/reduce 포함)
+    BOOKEND_MODEL: str = "gpt-4o"  # prologue/epilogue
+    COMPLETION_TOKEN_ESTIMATE: int = 400  # TPM 버킷에서 응답 토큰 몫으로 미리 빼 두는 양 (응답 후 실제 사용량으로 보정)
+    # OpenAI 호출 스케줄러
+    MAX_CONCURRENCY: int = 8  # 프로세스 전체 동시 호출 수
+    RPM_LIMIT: int = 0  # 이 프로세스의 분당 요청 수 (0 이면 제한 없음)
+    TPM_LIMIT: int = 0  # 이 프로세스의 분당 토큰 수 (0 이면 제한 없음)
+    MAX_RETRIES: int = 4
+    RETRY_BASE_DELAY: float = 0.5  # 재시도 백오프 기본 대기(초), 시도마다 두 배
+    RETRY_MAX_DELAY: float = 20.0
+    OPENAI_TIMEOUT: float = 60.0  # 호출 하나의 타임아웃(초). SDK 기본값(600초) 동안 매달리지 않도록 짧게 둠
+    # 회로 차단기: 최근 BREAKER_WINDOW 초 동안 호출이 BREAKER_MIN_CALLS 개 이상이고
+    # 실패(5xx/연결/타임아웃) 비율이나 느린 호출 비율이 기준을 넘으면 BREAKER_COOLDOWN 초 동안 호출을 바로 거절
+    BREAKER_ENABLED: bool = True
+    BREAKER_WINDOW: float = 60.0
+    BREAKER_MIN_CALLS: int = 10
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_MS: float = 30000
+    BREAKER_SLOW_RATE: float = 0.8
+    BREAKER_COOLDOWN: float = 30.0
+    BREAKER_HALF_OPEN_CALLS: int = 2  # cooldown 뒤 시험 삼아 보내는 호출 수, 모두 성공하면 closed
+    # 차단 중 /create, /finalize 의 처리: error: 503 / defer: 스토리가 빈(pending) 이미지를 저장하고 백그라운드 작업으로 생성
+    BREAKER_FALLBACK: str = "error"
+    # hedged request: 첫 호출이 모델 응답 시간의 HEDGE_PERCENTILE 백분위수 안에 끝나지 않으면 같은 요청을 한 번 더 보냄
+    HEDGE_ENABLED: bool = False
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_MIN_SAMPLES: int = 20  # 백분위수를 계산할 최소 샘플 수. 모자라면 hedge 하지 않음
+    HEDGE_MIN_DELAY: float = 1.0  # hedge 를 보내기 전 최소 대기(초)
     class Config:
         env_file=".env.gpt"
         env_file_encoding = "utf-8"
@@ -41,12 +185,39 @@ class PasswordSettings(BaseSettings):
     secret_for_jwt: str  # JWT 비밀키
     kakao_rest_api_key: str  # 카카오 REST API 키
     gmail_app_password: str
+    # /internal/* 조회용 토큰 (X-Internal-Token 헤더). 비어 있으면 /internal/* 는 404
+    internal_api_token: str = ""
 
     class Config:
         env_file = ".env.password"
         env_file_encoding = "utf-8"
 
+class FakeBackendSettings(BaseSettings):
+    """
+    부하 테스트용 가짜 백엔드 설정. 지연 시간은 다음 형식 중 하나로 지정합니다 (단위 ms).
+    fixed:<ms> | uniform:<min>,<max> | lognormal:<median>,<sigma>
+    """
+    openai_latency: str = "lognormal:800,0.5"  # 비스트리밍 응답 전체 지연
+    openai_ttft: str = "lognormal:300,0.4"  # 스트리밍 첫 토큰까지의 지연
+    openai_chunk_interval_ms: float = 25  # 스트리밍 조각 사이 간격
+    openai_completion_tokens: int = 120  # 응답 하나의 토큰(조각) 수
+    openai_error_429_rate: float = 0.0  # 429 를 돌려줄 확률
+    openai_error_5xx_rate: float = 0.0  # 500/503 을 돌려줄 확률
+    openai_retry_after: float = 1.0  # 429 응답의 retry-after(초)
+    s3_latency: str = "fixed:0"  # 메모리 S3 호출 하나의 지연
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="FAKE_",
+        env_file=SETTINGS.env_file,
+    )
+
 PW_SETTINGS = PasswordSettings()
 DB_SETTINGS = DatabaseSettings()
 AWS_SETTINGS = AWSSettings()
-GPT_SETTINGS = GPTSettings()
\ No newline at end of file
+IMAGE_SETTINGS = ImageSettings()
+JOB_SETTINGS = JobSettings()
+CHAPTER_SETTINGS = ChapterSettings()
+IDEMPOTENCY_SETTINGS = IdempotencySettings()
+GPT_SETTINGS = GPTSettings()
+FAKE_SETTINGS = FakeBackendSettings()
\ No newline at end of file
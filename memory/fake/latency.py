@@ -0,0 +1,21 @@
+import random
+from typing import Callable
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    "fixed:<ms>", "uniform:<min>,<max>", "lognormal:<median>,<sigma>" 형식의 지연 분포를
+    호출할 때마다 초 단위 지연 시간을 뽑는 함수로 바꿉니다.
+    lognormal 은 실제 API 처럼 긴 꼬리(tail latency)가 있는 분포를 흉내 내는 데 사용합니다.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        # lognormvariate 의 중앙값은 exp(mu) 이므로 mu=0 으로 뽑은 뒤 median 을 곱함
+        return lambda: median * random.lognormvariate(0, sigma) / 1000
+    raise ValueError(f"지원하지 않는 지연 분포 형식입니다: {spec}")
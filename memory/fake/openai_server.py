@@ -0,0 +1,123 @@
+"""
+부하 테스트용 OpenAI 호환 chat.completions 스텁 서버.
+
+    uvicorn memory.fake.openai_server:app --port 8100
+
+앱 쪽에는 OPENAI_BASE_URL=http://127.0.0.1:8100/v1 을 설정합니다 (.env.gpt 또는 환경변수).
+
+지연 분포와 오류 비율은 FAKE_* 설정으로 정하고, 실행 중에는 PUT /_config 로 바꿀 수 있습니다.
+"""
+import asyncio
+import json
+import random
+import time
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from memory.common.tokens import estimate_message_tokens
+from memory.database.settings import FAKE_SETTINGS, GPT_SETTINGS
+from memory.fake.latency import parse_latency
+
+app = FastAPI()
+
+FAKE_SETTING_FIELDS = set(type(FAKE_SETTINGS).model_fields)
+WORDS = ["그날의", "햇살은", "유난히", "따뜻했고,", "나는", "사진", "속", "풍경을", "오래", "바라보았다."]
+
+
+def _error() -> JSONResponse | None:
+    roll = random.random()
+    if roll < FAKE_SETTINGS.openai_error_429_rate:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            headers={"retry-after": str(FAKE_SETTINGS.openai_retry_after)},
+        )
+    if roll < FAKE_SETTINGS.openai_error_429_rate + FAKE_SETTINGS.openai_error_5xx_rate:
+        status_code = random.choice([500, 503])
+        return JSONResponse(
+            status_code=status_code,
+            content={"error": {"message": "The server had an error", "type": "server_error", "code": None}},
+        )
+    return None
+
+
+def _usage(prompt_tokens: int) -> dict:
+    completion_tokens = FAKE_SETTINGS.openai_completion_tokens
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    error = _error()
+    if error is not None:
+        return error
+
+    model = body.get("model", "gpt-4o")
+    prompt_tokens = estimate_message_tokens(body.get("messages", []), GPT_SETTINGS.IMAGE_TOKEN_ESTIMATE)
+    completion_id = f"chatcmpl-{uuid4().hex}"
+    created = int(time.time())
+    words = [random.choice(WORDS) + " " for _ in range(FAKE_SETTINGS.openai_completion_tokens)]
+
+    if not body.get("stream"):
+        await asyncio.sleep(parse_latency(FAKE_SETTINGS.openai_latency)())
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(words).strip()},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(prompt_tokens),
+        }
+
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+    def chunk(delta: dict, finish_reason: str | None = None, usage: dict | None = None, choices: bool = True) -> str:
+        data = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if choices else [],
+            "usage": usage,
+        }
+        return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def events():
+        await asyncio.sleep(parse_latency(FAKE_SETTINGS.openai_ttft)())
+        yield chunk({"role": "assistant", "content": ""})
+        for word in words:
+            yield chunk({"content": word})
+            await asyncio.sleep(FAKE_SETTINGS.openai_chunk_interval_ms / 1000)
+        yield chunk({}, finish_reason="stop")
+        if include_usage:
+            yield chunk({}, usage=_usage(prompt_tokens), choices=False)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/_config")
+async def get_config() -> dict:
+    return FAKE_SETTINGS.model_dump()
+
+
+@app.put("/_config")
+async def update_config(values: dict) -> dict:
+    """벤치마크 도중 지연 분포/오류 비율을 바꿀 때 사용합니다. 알 수 없는 키는 무시합니다."""
+    for key, value in values.items():
+        if key in FAKE_SETTING_FIELDS:
+            if key.endswith(("latency", "ttft")):
+                parse_latency(value)
+            setattr(FAKE_SETTINGS, key, value)
+    return FAKE_SETTINGS.model_dump()
@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+
+from memory.database.settings import AWS_SETTINGS, FAKE_SETTINGS
+from memory.fake.latency import parse_latency
+
+
+class InMemoryS3Client:
+    """
+    ImageStore 가 사용하는 aioboto3 S3 클라이언트 메서드만 흉내 내는 프로세스 내 저장소.
+    AWS_S3_BACKEND=memory 일 때 S3ClientManager 가 실제 클라이언트 대신 사용하며,
+    네트워크 없이 업로드 경로 전체를 부하 테스트할 수 있게 합니다. 호출마다 FAKE_S3_LATENCY 만큼 지연합니다.
+    본문은 읽는 곳이 없으므로 크기와 MD5 만 남겨, 오래 돌리는 부하 테스트에서도 메모리가 사진 용량만큼 늘지 않게 합니다.
+    """
+
+    def __init__(self):
+        # (bucket, key) -> (크기, Content-Type, ETag)
+        self._objects: dict[tuple[str, str], tuple[int, str | None, str]] = {}
+        # upload id -> (Content-Type, part 번호 -> (크기, MD5 digest))
+        self._uploads: dict[str, tuple[str | None, dict[int, tuple[int, bytes]]]] = {}
+        self._latency = parse_latency(FAKE_SETTINGS.s3_latency)
+
+    async def _delay(self) -> None:
+        delay = self._latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str | None = None, **kwargs) -> dict:
+        await self._delay()
+        etag = f'"{hashlib.md5(Body).hexdigest()}"'
+        self._objects[(Bucket, Key)] = (len(Body), ContentType, etag)
+        return {"ETag": etag}
+
+    async def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        await self._delay()
+        obj = self._objects.get((Bucket, Key))
+        if obj is None:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        size, content_type, etag = obj
+        return {"ContentLength": size, "ContentType": content_type or "binary/octet-stream", "ETag": etag}
+
+    async def create_multipart_upload(self, Bucket: str, Key: str, ContentType: str | None = None, **kwargs) -> dict:
+        await self._delay()
+        upload_id = uuid4().hex
+        self._uploads[upload_id] = (ContentType, {})
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes, **kwargs) -> dict:
+        await self._delay()
+        upload = self._uploads.get(UploadId)
+        if upload is None:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "Not Found"}}, "UploadPart")
+        digest = hashlib.md5(Body).digest()
+        upload[1][PartNumber] = (len(Body), digest)
+        return {"ETag": f'"{digest.hex()}"'}
+
+    async def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict, **kwargs,
+    ) -> dict:
+        await self._delay()
+        upload = self._uploads.pop(UploadId, None)
+        if upload is None:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "Not Found"}}, "CompleteMultipartUpload")
+        content_type, parts = upload
+        used = [parts[part["PartNumber"]] for part in MultipartUpload["Parts"]]
+        # S3 와 같은 형식의 multipart ETag: part MD5 들을 이어 붙인 것의 MD5 + "-part 수"
+        etag = f'"{hashlib.md5(b"".join(digest for _, digest in used)).hexdigest()}-{len(used)}"'
+        self._objects[(Bucket, Key)] = (sum(size for size, _ in used), content_type, etag)
+        return {"Key": Key, "ETag": etag}
+
+    async def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> dict:
+        await self._delay()
+        self._uploads.pop(UploadId, None)
+        return {}
+
+    async def generate_presigned_post(
+        self, Bucket: str, Key: str, Fields: dict | None = None, Conditions: list | None = None, ExpiresIn: int = 3600,
+    ) -> dict:
+        base_url = AWS_SETTINGS.s3_endpoint_url or "http://localhost"
+        return {"url": f"{base_url}/{Bucket}", "fields": {**(Fields or {}), "key": Key}}
@@ -1,28 +1,45 @@
-import os, sys
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 
 from memory.api import api_router
 from memory.database.middleware import DefaultSessionMiddleware
 from memory.database.settings import GPTSettings
+from memory.common.s3_client import S3_CLIENT
+from memory.app.image.preprocess import PREPROCESS_POOL
+from memory.app.image.speculative import SPECULATIVE_STORIES
+from memory.app.job.worker import STORY_JOB_WORKER
+from memory.app.chapter.summary import CHAPTER_SUMMARIZER
+from memory.app.chapter.bookend import CHAPTER_BOOKENDS
 
 GPT_SETTINGS = GPTSettings()
 
-SECRET_KEY = os.urandom(32).hex()
-
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await S3_CLIENT.start()
+    await STORY_JOB_WORKER.start()
+    try:
+        yield
+    finally:
+        await STORY_JOB_WORKER.stop()
+        await SPECULATIVE_STORIES.stop()
+        await CHAPTER_SUMMARIZER.stop()
+        await CHAPTER_BOOKENDS.stop()
+        PREPROCESS_POOL.shutdown()
+        await S3_CLIENT.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:3001", "https://www.memory123.store", "https://memory123.store"],
     allow_credentials=True,
     allow_methods=["GET","POST","PUT","DELETE","OPTIONS"],
-    allow_headers=["Content-Type","Authorization"],
+    allow_headers=["Content-Type","Authorization","Idempotency-Key"],
 )
 
 
-app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 app.add_middleware(DefaultSessionMiddleware)
 app.include_router(api_router, prefix="/api")
 
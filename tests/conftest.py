@@ -0,0 +1,21 @@
+import os
+
+# 설정 클래스들이 import 시점에 필수 값을 읽으므로 테스트용 값을 먼저 채움 (실제 DB/S3/OpenAI 에는 연결하지 않음)
+for name, value in {
+    "AWS_ACCESS_KEY_ID": "test",
+    "AWS_SECRET_ACCESS_KEY": "test",
+    "AWS_DEFAULT_REGION": "ap-northeast-2",
+    "AWS_S3_BUCKET": "test-bucket",
+    "OPENAI_API_KEY": "sk-test",
+    "SECRET_FOR_JWT": "test",
+    "KAKAO_REST_API_KEY": "test",
+    "GMAIL_APP_PASSWORD": "test",
+    "DB_DIALECT": "mysql",
+    "DB_DRIVER": "aiomysql",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_DATABASE": "test",
+}.items():
+    os.environ.setdefault(name, value)
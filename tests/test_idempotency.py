@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from memory.app.chapter.dto.reponses import ChapterProfileResponse
+from memory.app.idempotency.errors import IdempotencyKeyReusedError
+from memory.app.idempotency.service import IdempotencyCache, request_fingerprint
+from memory.app.idempotency.store import DONE
+from memory.database.settings import IDEMPOTENCY_SETTINGS
+
+
+def _handler(calls: list, name: str):
+    async def handler() -> ChapterProfileResponse:
+        calls.append(name)
+        return ChapterProfileResponse(id=len(calls), chapter_name=name)
+    return handler
+
+
+def test_same_key_and_payload_replays_first_response(monkeypatch):
+    monkeypatch.setattr(IDEMPOTENCY_SETTINGS, "backend", "memory")
+    cache = IdempotencyCache()
+    calls: list = []
+    fingerprint = request_fingerprint({"name": "a"})
+
+    async def main():
+        first = await cache.run("k", 1, "chapters.create", fingerprint, _handler(calls, "a"), ChapterProfileResponse)
+        second = await cache.run("k", 1, "chapters.create", fingerprint, _handler(calls, "a"), ChapterProfileResponse)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert calls == ["a"]
+    assert first == second
+
+
+def test_same_key_with_different_payload_is_rejected(monkeypatch):
+    monkeypatch.setattr(IDEMPOTENCY_SETTINGS, "backend", "memory")
+    cache = IdempotencyCache()
+    calls: list = []
+
+    async def main():
+        await cache.run(
+            "k", 1, "chapters.create", request_fingerprint({"name": "a"}),
+            _handler(calls, "a"), ChapterProfileResponse,
+        )
+        await cache.run(
+            "k", 1, "chapters.create", request_fingerprint({"name": "b"}),
+            _handler(calls, "b"), ChapterProfileResponse,
+        )
+
+    with pytest.raises(IdempotencyKeyReusedError) as exc_info:
+        asyncio.run(main())
+    assert exc_info.value.status_code == 422
+    assert calls == ["a"]
+
+
+def test_different_payload_while_first_is_in_flight_is_rejected(monkeypatch):
+    monkeypatch.setattr(IDEMPOTENCY_SETTINGS, "backend", "memory")
+    cache = IdempotencyCache()
+    calls: list = []
+
+    async def main():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow() -> ChapterProfileResponse:
+            started.set()
+            await release.wait()
+            return await _handler(calls, "a")()
+
+        first = asyncio.create_task(cache.run(
+            "k", 1, "chapters.create", request_fingerprint({"name": "a"}), slow, ChapterProfileResponse,
+        ))
+        await started.wait()
+        try:
+            await cache.run(
+                "k", 1, "chapters.create", request_fingerprint({"name": "b"}),
+                _handler(calls, "b"), ChapterProfileResponse,
+            )
+        finally:
+            release.set()
+            await first
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        asyncio.run(main())
+    assert calls == ["a"]
+
+
+def test_db_record_with_different_fingerprint_is_rejected(monkeypatch):
+    monkeypatch.setattr(IDEMPOTENCY_SETTINGS, "backend", "db")
+    cache = IdempotencyCache()
+    calls: list = []
+    released: list = []
+
+    class Store:
+        async def purge_expired(self) -> int:
+            return 0
+
+        async def claim(self, key: str, fingerprint: str, pending_timeout: int):
+            # 다른 워커가 같은 키를 다른 내용으로 이미 처리한 상태
+            return SimpleNamespace(
+                status=DONE,
+                fingerprint=request_fingerprint({"name": "a"}),
+                response='{"id": 1, "chapter_name": "a"}',
+            )
+
+        async def release(self, key: str) -> None:
+            released.append(key)
+
+    cache.store = Store()
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        asyncio.run(cache.run(
+            "k", 1, "chapters.create", request_fingerprint({"name": "b"}),
+            _handler(calls, "b"), ChapterProfileResponse,
+        ))
+    assert calls == []
+    assert released == []
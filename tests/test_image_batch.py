@@ -0,0 +1,53 @@
+import asyncio
+from types import SimpleNamespace
+
+import memory.app.image.views as views
+from memory.database.settings import GPT_SETTINGS
+
+
+def test_batch_prompt_keeps_only_recent_stories_in_summary_mode(monkeypatch):
+    prompts: list[list[str]] = []
+    saved: list[tuple] = []
+
+    async def release_session():
+        pass
+
+    async def upload_image_for_story(user_id, file):
+        model_image = SimpleNamespace(url=lambda: f"https://s3/{file}", content_type="image/png")
+        return SimpleNamespace(file_key=f"uploads/{user_id}/{file}"), model_image
+
+    async def get_story_context(chapter_id):
+        return "요약", ["이전 1", "이전 2"]
+
+    async def generate_continuous_story(previous_stories, **kwargs):
+        prompts.append(list(previous_stories))
+        return f"스토리 {len(prompts)}"
+
+    async def add_images(user_id, chapter_id, items):
+        saved.extend(items)
+        return items
+
+    monkeypatch.setattr(GPT_SETTINGS, "STORY_CONTEXT_MODE", "summary")
+    monkeypatch.setattr(GPT_SETTINGS, "STORY_RECENT_COUNT", 3)
+    monkeypatch.setattr(views, "release_session", release_session)
+    monkeypatch.setattr(views, "generate_continuous_story", generate_continuous_story)
+    monkeypatch.setattr(views.ImageListResponse, "from_images", staticmethod(lambda images: images))
+    monkeypatch.setattr(views.CHAPTER_SUMMARIZER, "schedule", lambda chapter_id: None)
+    monkeypatch.setattr(views.CHAPTER_BOOKENDS, "notify", lambda chapter_id: None)
+
+    asyncio.run(views.create_images_batch(
+        user=SimpleNamespace(id=7),
+        chapter_id=3,
+        image_service=SimpleNamespace(upload_image_for_story=upload_image_for_story),
+        chapter_service=SimpleNamespace(get_story_context=get_story_context),
+        image_store=SimpleNamespace(add_images=add_images),
+        files=[f"f{i}" for i in range(6)],
+        keywords=None,
+        queries=None,
+    ))
+
+    # 배치가 길어져도 프롬프트에는 최근 STORY_RECENT_COUNT 개만 들어감
+    assert max(len(p) for p in prompts) == 3
+    assert prompts[0] == ["이전 1", "이전 2"]
+    assert prompts[-1] == ["스토리 3", "스토리 4", "스토리 5"]
+    assert [story for _, story in saved] == [f"스토리 {i}" for i in range(1, 7)]
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import memory.app.image.views as views
+from memory.common.s3_client import PRESIGNED_URLS
+
+
+class FakeStory:
+    """stream_continuous_story 대역. 닫혔는지 기록합니다."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def stream(self, **kwargs):
+        try:
+            for delta in ["옛날 ", "옛적에 ", "사진이 ", "있었다."]:
+                await asyncio.sleep(0.01)
+                yield delta
+        finally:
+            self.closed = True
+
+
+class FakeImageStore:
+    def __init__(self, save_delay: float = 0, story: FakeStory | None = None):
+        self.save_delay = save_delay
+        self.story = story
+        self.saved: list[tuple] = []
+        self.stream_closed_before_save: bool | None = None
+
+    async def add_image(self, user_id, chapter_id, file_key, content=None, story_status="done"):
+        return SimpleNamespace(
+            id=1, file_key=file_key, chapter_id=chapter_id, user_id=user_id, is_main=False,
+            content=content, story_status=story_status, story_version=1,
+        )
+
+    async def save_story(self, image_id, content, story_status):
+        if self.story is not None:
+            self.stream_closed_before_save = self.story.closed
+        await asyncio.sleep(self.save_delay)
+        self.saved.append((image_id, content, story_status))
+
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    story = FakeStory()
+    scheduled: list[int] = []
+    notified: list[int] = []
+
+    async def release_session():
+        pass
+
+    async def upload_image_for_story(user_id, file):
+        model_image = SimpleNamespace(url=lambda: "https://s3/model", content_type="image/png")
+        return SimpleNamespace(file_key=f"uploads/{user_id}/a"), model_image
+
+    async def get_story_context(chapter_id):
+        return None, []
+
+    monkeypatch.setattr(views, "release_session", release_session)
+    monkeypatch.setattr(views, "stream_continuous_story", story.stream)
+    monkeypatch.setattr(views.CHAPTER_SUMMARIZER, "schedule", scheduled.append)
+    monkeypatch.setattr(views.CHAPTER_BOOKENDS, "notify", notified.append)
+    monkeypatch.setattr(PRESIGNED_URLS, "get_url", lambda key: f"https://s3/{key}")
+
+    async def open_stream(image_store: FakeImageStore):
+        response = await views.create_image_stream(
+            user=SimpleNamespace(id=7),
+            chapter_id=3,
+            image_service=SimpleNamespace(upload_image_for_story=upload_image_for_story),
+            chapter_service=SimpleNamespace(get_story_context=get_story_context),
+            image_store=image_store,
+            file=None,
+            query=None,
+            keyword=None,
+        )
+        return response.body_iterator
+
+    return SimpleNamespace(story=story, scheduled=scheduled, notified=notified, open_stream=open_stream)
+
+
+def test_closed_stream_saves_partial_story_and_closes_model_stream(stream_env):
+    image_store = FakeImageStore(story=stream_env.story)
+
+    async def main():
+        body = await stream_env.open_stream(image_store)
+        assert "event: image" in await body.__anext__()
+        assert "옛날" in await body.__anext__()
+        # 클라이언트가 끊겨 응답 본문 제너레이터가 닫힘
+        await body.aclose()
+
+    asyncio.run(main())
+    # OpenAI 스트림은 GC 를 기다리지 않고 저장 전에 닫혀야 함
+    assert image_store.stream_closed_before_save is True
+    assert image_store.saved == [(1, "옛날", "partial")]
+    assert stream_env.scheduled == [3]
+    assert stream_env.notified == [3]
+
+
+def test_cancelled_stream_still_schedules_summary_after_save(stream_env):
+    image_store = FakeImageStore(save_delay=0.1)
+
+    async def main():
+        body = await stream_env.open_stream(image_store)
+
+        async def consume():
+            async for _ in body:
+                pass
+
+        # 스트림이 끝나고 저장하는 도중에 연결이 끊겨 응답 태스크가 취소돼도 요약/bookend 예약까지 이어져야 함
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.08)
+        assert not image_store.saved
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.15)
+
+    asyncio.run(main())
+    assert stream_env.story.closed
+    assert image_store.saved == [(1, "옛날 옛적에 사진이 있었다.", "done")]
+    assert stream_env.scheduled == [3]
+    assert stream_env.notified == [3]
+
+
+def test_finished_stream_saves_story_and_sends_done(stream_env):
+    image_store = FakeImageStore()
+
+    async def main():
+        body = await stream_env.open_stream(image_store)
+        return [chunk async for chunk in body]
+
+    chunks = asyncio.run(main())
+    assert chunks[-1].startswith("event: done")
+    assert image_store.saved == [(1, "옛날 옛적에 사진이 있었다.", "done")]
+    assert stream_env.scheduled == [3]
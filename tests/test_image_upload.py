@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import os
+from concurrent.futures.process import BrokenProcessPool
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from PIL.Image import DecompressionBombError
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+import memory.app.image.service as service_module
+from memory.app.image.service import ImageService
+from memory.common.s3_client import PRESIGNED_URLS
+from memory.database.settings import IMAGE_SETTINGS
+
+PART_SIZE = 64 * 1024
+
+
+class TrackingUploadFile(UploadFile):
+    """read() 한 번에 돌려준 최대 바이트 수를 기록하는 UploadFile"""
+
+    max_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await super().read(size)
+        self.max_read = max(self.max_read, len(chunk))
+        return chunk
+
+
+class FakeImageStore:
+    """S3/DB 대신 파트 단위로 읽어 해시만 계산하는 ImageStore 대역"""
+
+    def __init__(self):
+        self.uploaded: dict[str, int] = {}
+        self.variants: dict[str, bytes] = {}
+        self.stored: list[tuple] = []
+        self.model_keys: list[tuple] = []
+
+    async def upload_image_in_S3(self, s3_path, file, find_existing=None):
+        hasher = hashlib.sha256()
+        size = 0
+        while chunk := await file.read(PART_SIZE):
+            hasher.update(chunk)
+            size += len(chunk)
+        self.uploaded[s3_path] = size
+        return s3_path, hasher.hexdigest(), size
+
+    async def get_stored_object(self, user_id, sha256):
+        return None
+
+    async def add_stored_object(self, user_id, sha256, file_key, content_type, size):
+        self.stored.append((user_id, sha256, file_key, size))
+
+    async def put_bytes(self, s3_path, body, content_type):
+        self.variants[s3_path] = body
+        return s3_path
+
+    async def set_model_key(self, user_id, sha256, model_key):
+        self.model_keys.append((user_id, sha256, model_key))
+
+
+class FakePreprocessPool:
+    def __init__(self):
+        self.inputs: list[int] = []
+
+    async def downscale(self, data: bytes) -> bytes:
+        self.inputs.append(len(data))
+        return b"variant"
+
+
+def _upload_file(data: bytes) -> TrackingUploadFile:
+    spool = SpooledTemporaryFile(max_size=1024)
+    spool.write(data)
+    spool.seek(0)
+    return TrackingUploadFile(
+        file=spool, size=len(data), filename="photo.jpg", headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+
+@pytest.fixture
+def upload_env(monkeypatch):
+    pool = FakePreprocessPool()
+    monkeypatch.setattr(service_module, "PREPROCESS_POOL", pool)
+    monkeypatch.setattr(IMAGE_SETTINGS, "preprocess_enabled", True)
+    monkeypatch.setattr(IMAGE_SETTINGS, "preprocess_max_bytes", 256 * 1024)
+    monkeypatch.setattr(PRESIGNED_URLS, "get_url", lambda key: f"https://s3/{key}")
+    return pool
+
+
+def test_large_upload_is_never_read_into_memory_in_full(upload_env):
+    store = FakeImageStore()
+    data = os.urandom(4 * 1024 * 1024)
+    file = _upload_file(data)
+
+    url_resp, model_image = asyncio.run(ImageService(store).upload_image_for_story(7, file))
+
+    # 축소용 읽기는 preprocess_max_bytes + 1 에서 멈추고, 업로드는 파트 단위로만 읽음
+    assert file.max_read <= IMAGE_SETTINGS.preprocess_max_bytes + 1
+    assert upload_env.inputs == []
+    assert store.uploaded == {url_resp.file_key: len(data)}
+    assert store.stored[0][1] == hashlib.sha256(data).hexdigest()
+    # 상한을 넘는 원본은 축소하지 않고 그대로 모델 입력으로 씀
+    assert model_image.key == url_resp.file_key
+    assert model_image.data is None
+
+
+def test_small_upload_keeps_only_downscaled_bytes(upload_env):
+    store = FakeImageStore()
+    data = os.urandom(200 * 1024)
+    file = _upload_file(data)
+
+    url_resp, model_image = asyncio.run(ImageService(store).upload_image_for_story(7, file))
+
+    assert upload_env.inputs == [len(data)]
+    assert store.uploaded == {url_resp.file_key: len(data)}
+    assert url_resp.file_key.startswith("uploads/7/")
+    assert model_image.key == f"model/{url_resp.file_key}.jpg"
+    assert model_image.data == b"variant"
+    assert store.model_keys == [(7, hashlib.sha256(data).hexdigest(), model_image.key)]
+
+
+@pytest.mark.parametrize(
+    "error", [ValueError("bad image"), DecompressionBombError("too many pixels"), BrokenProcessPool("worker died")],
+)
+def test_failed_preprocessing_falls_back_to_original(upload_env, monkeypatch, error):
+    async def downscale(data: bytes) -> bytes:
+        raise error
+
+    monkeypatch.setattr(upload_env, "downscale", downscale)
+    store = FakeImageStore()
+    data = os.urandom(200 * 1024)
+
+    url_resp, model_image = asyncio.run(ImageService(store).upload_image_for_story(7, _upload_file(data)))
+
+    assert store.uploaded == {url_resp.file_key: len(data)}
+    assert model_image.key == url_resp.file_key
+    assert store.variants == {}